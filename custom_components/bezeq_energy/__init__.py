@@ -9,21 +9,38 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+import homeassistant.util.dt as dt_util
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME, Platform
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.loader import async_get_loaded_integration
-from my_bezeq import MyBezeqAPI
+from my_bezeq import ElectricReportLevel
 
+from .account import async_acquire_account, async_release_account
+from .anomaly import AnomalyDetector
+from .backfill import BezeqBackfill
+from .commons import timezone
 from .const import (
     CONF_CONTRACT_NUMBER,
     CONF_COUNTER_NUMBER,
     CONF_IS_SMART_METER,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_REQUEST_TIMEOUT,
+    CONF_STATISTICS_LEVEL,
     CONF_SUBSCRIBER_NUMBER,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_REQUEST_TIMEOUT,
+    DEFAULT_STATISTICS_LEVEL,
     DOMAIN,
     LOGGER,
+    STATISTICS_LEVEL_DAILY,
 )
 from .coordinator import BezeqElecDataUpdateCoordinator
 from .data import BezeqEnergyData, BezeqEnergyDeviceInfo
+from .fleet import async_get_fleet
+from .ledger import InvoiceLedger
+from .services import async_setup_services
+from .snapshot_store import SnapshotStore
+from .statistics import BezeqStatisticsImporter
+from .usage_cache import UsageCache
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
@@ -44,13 +61,30 @@ async def async_setup_entry(
     """Set up this integration using UI."""
     coordinator = BezeqElecDataUpdateCoordinator(
         hass=hass,
+        max_concurrent_requests=entry.options.get(
+            CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+        ),
+        request_timeout=entry.options.get(
+            CONF_REQUEST_TIMEOUT, DEFAULT_REQUEST_TIMEOUT
+        ),
     )
+    # Entries logging in with the same username share one client and session
+    account = async_acquire_account(
+        hass, entry.data[CONF_USERNAME], entry.data[CONF_PASSWORD]
+    )
+    entry.async_on_unload(lambda: async_release_account(hass, account))
+    entry.async_on_unload(coordinator.async_shutdown)
+    usage_cache = UsageCache(hass, entry.entry_id, flights=account.flights)
+    await usage_cache.async_load()
+    invoice_ledger = InvoiceLedger(hass, entry.entry_id)
+    await invoice_ledger.async_load()
+    fleet = async_get_fleet(hass)
+
     entry.runtime_data = BezeqEnergyData(
-        client=MyBezeqAPI(
-            user_id=entry.data[CONF_USERNAME],
-            password=entry.data[CONF_PASSWORD],
-            session=async_get_clientsession(hass),
-        ),
+        account=account,
+        usage_cache=usage_cache,
+        invoice_ledger=invoice_ledger,
+        snapshot_store=SnapshotStore(hass, entry.entry_id),
         integration=async_get_loaded_integration(hass, entry.domain),
         coordinator=coordinator,
         device_info=BezeqEnergyDeviceInfo(
@@ -59,24 +93,74 @@ async def async_setup_entry(
             contract_number=entry.data.get(CONF_CONTRACT_NUMBER),
             subscriber_number=entry.data.get(CONF_SUBSCRIBER_NUMBER),
         ),
+        fleet=fleet,
+    )
+
+    if entry.runtime_data.device_info.is_smart_meter:
+        statistics = BezeqStatisticsImporter(
+            hass,
+            entry.entry_id,
+            entry.data.get(CONF_CONTRACT_NUMBER) or entry.entry_id,
+            usage_cache,
+            level=ElectricReportLevel.DAILY
+            if entry.options.get(CONF_STATISTICS_LEVEL, DEFAULT_STATISTICS_LEVEL)
+            == STATISTICS_LEVEL_DAILY
+            else ElectricReportLevel.HOURLY,
+        )
+        await statistics.async_load()
+        entry.runtime_data.statistics = statistics
+
+        backfill = BezeqBackfill(hass, entry.entry_id, entry.runtime_data, statistics)
+        await backfill.async_load()
+        entry.runtime_data.backfill = backfill
+
+        anomaly_detector = AnomalyDetector(hass, entry.entry_id)
+        await anomaly_detector.async_load()
+        entry.runtime_data.anomaly_detector = anomaly_detector
+
+    # Every account polls at its own phase of the interval, not all at once
+    coordinator.async_set_phase(
+        fleet.async_register(account.account_id, coordinator.scheduler.tick_interval)
     )
 
-    # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
-    await coordinator.async_config_entry_first_refresh()
+    # Start from the last good data if we have it, so Home Assistant startup never
+    # waits on the Bezeq cloud. Fresh data waits for the account's phase, stale
+    # data is refreshed in the background right away
+    if await coordinator.async_restore_snapshot():
+        if coordinator.is_stale:
+            entry.async_create_background_task(
+                hass,
+                coordinator.async_refresh(),
+                f"{DOMAIN}_refresh_{entry.entry_id}",
+            )
+    else:
+        # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
+        await coordinator.async_config_entry_first_refresh()
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
+    if (backfill := entry.runtime_data.backfill) and not backfill.done:
+        # Importing years of history takes a while, never hold up setup for it
+        entry.async_create_background_task(
+            hass,
+            backfill.async_run(dt_util.now(timezone).date()),
+            f"{DOMAIN}_backfill_{entry.entry_id}",
+        )
+
     # Register the debug service
     async def handle_debug_get_coordinator_data(call) -> None:  # noqa: ANN001 ARG001
         # Log or return coordinator data
         data = coordinator.data
         LOGGER.info("Coordinator data: %s", data)
-        hass.bus.async_fire("custom_component_debug_event", {"data": data})
+        hass.bus.async_fire(
+            "custom_component_debug_event", {"data": data.as_dict() if data else None}
+        )
 
     hass.services.async_register(
         DOMAIN, "debug_get_coordinator_data", handle_debug_get_coordinator_data
     )
+    async_setup_services(hass)
 
     return True
 
@@ -94,5 +178,5 @@ async def async_reload_entry(
     entry: BezeqEnergyConfigEntry,
 ) -> None:
     """Reload config entry."""
-    await async_unload_entry(hass, entry)
-    await async_setup_entry(hass, entry)
+    # A full reload also runs the unload callbacks, releasing the shared account
+    await hass.config_entries.async_reload(entry.entry_id)
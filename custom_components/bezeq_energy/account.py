@@ -0,0 +1,92 @@
+"""my.bezeq accounts shared between config entries."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from my_bezeq import MyBezeqAPI
+
+from .const import ACCOUNT_RESPONSE_TTL, DOMAIN, LOGGER
+from .fleet import async_get_fleet
+from .session import BezeqSessionManager, get_account_id
+from .singleflight import SingleFlight
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from homeassistant.core import HomeAssistant
+
+DATA_ACCOUNTS = "accounts"
+
+
+@callback
+def async_acquire_account(
+    hass: HomeAssistant, username: str, password: str
+) -> BezeqAccount:
+    """Return the shared account for a username, creating it on first use."""
+    accounts: dict[str, BezeqAccount] = hass.data.setdefault(DOMAIN, {}).setdefault(
+        DATA_ACCOUNTS, {}
+    )
+    if (account := accounts.get(username)) is None:
+        client = MyBezeqAPI(
+            user_id=username,
+            password=password,
+            session=async_get_clientsession(hass),
+        )
+        account = accounts[username] = BezeqAccount(hass, client)
+    elif account.client.password != password:
+        # The newest entry wins, e.g. after a reauth changed the password
+        LOGGER.debug("Password changed for a shared my.bezeq account")
+        account.client.password = password
+    account.refs += 1
+    return account
+
+
+@callback
+def async_release_account(hass: HomeAssistant, account: BezeqAccount) -> None:
+    """Drop a reference to a shared account, forgetting it with the last one."""
+    account.refs -= 1
+    if account.refs > 0:
+        return
+    hass.data[DOMAIN][DATA_ACCOUNTS].pop(account.client.user_id, None)
+    account.flights.async_cancel()
+    async_get_fleet(hass).async_unregister(account.account_id)
+
+
+class BezeqAccount:
+    """
+    One my.bezeq login, shared by every config entry that uses it.
+
+    Entries of the same account hold one client and one session, so the account
+    logs in and loads the dashboard once. Responses are shared too, keyed by
+    endpoint and parameters: a fetch already in flight is joined, and a recent
+    response is reused, so entries refreshing together only fetch each once.
+    """
+
+    def __init__(self, hass: HomeAssistant, client: MyBezeqAPI) -> None:
+        """Initialize."""
+        fleet = async_get_fleet(hass)
+        self.client = client
+        self.account_id = get_account_id(client.user_id)
+        self.session = BezeqSessionManager(hass, client, fleet.limiter)
+        self.refs = 0
+        self.flights = SingleFlight(hass)
+
+    async def async_get_response(
+        self,
+        name: str,
+        fetch: Callable[[], Awaitable[Any]],
+        max_age: float = ACCOUNT_RESPONSE_TTL,
+    ) -> Any:
+        """Return a response shared by every entry of this account."""
+        return await self.flights.async_call(name, fetch, max_age)
+
+    def as_diagnostics(self) -> dict[str, Any]:
+        """Return account sharing statistics for diagnostics."""
+        return {
+            "entries": self.refs,
+            "session": self.session.as_diagnostics(),
+            "responses": self.flights.as_diagnostics(),
+        }
@@ -0,0 +1,122 @@
+"""Local aggregation of daily smart meter usage."""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date, datetime, time
+from typing import TYPE_CHECKING, Any
+
+from dateutil.relativedelta import relativedelta
+from my_bezeq import MonthlyUsage
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from my_bezeq import DailyUsage
+
+
+class DailyUsageSeries:
+    """
+    Daily usage of the current and previous month, with running month totals.
+
+    Records are merged as they are fetched. Only days whose value changed touch
+    the month totals, so the monthly figures cost nothing to read and the
+    MONTHLY usage report is no longer needed every cycle.
+    """
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._days: dict[tuple[str, date], DailyUsage] = {}
+        self._totals: dict[tuple[str, date], float] = defaultdict(float)
+        self._first_month: date | None = None
+        self._subscribers: set[str] = set()
+
+    @property
+    def first_day(self) -> date | None:
+        """Return the first day the series covers."""
+        return self._first_month
+
+    @property
+    def subscribers(self) -> set[str]:
+        """Return the subscribers with usage in the series."""
+        return self._subscribers
+
+    def update(self, records: Iterable[DailyUsage], today: date) -> int:
+        """Merge fetched daily records, return how many days changed."""
+        self._prune((today - relativedelta(months=1)).replace(day=1))
+        changed = 0
+        for record in records:
+            day = record.usage_day.date()
+            if day < self._first_month:
+                continue
+            key = (record.subscriber, day)
+            previous = self._days.get(key)
+            if previous is not None and previous.sum_all_day == record.sum_all_day:
+                continue
+            self._days[key] = record
+            self._subscribers.add(record.subscriber)
+            delta = record.sum_all_day or 0.0
+            if previous is not None:
+                delta -= previous.sum_all_day or 0.0
+            self._totals[(record.subscriber, day.replace(day=1))] += delta
+            changed += 1
+        return changed
+
+    def get_record(self, subscriber: str, day: date) -> DailyUsage | None:
+        """Return the record of a subscriber's day."""
+        return self._days.get((subscriber, day))
+
+    def get_day(self, day: date, include: Callable[[str], bool]) -> DailyUsage | None:
+        """Return the record of `day` for the first included subscriber."""
+        return next(
+            (
+                record
+                for (subscriber, record_day), record in self._days.items()
+                if record_day == day and include(subscriber)
+            ),
+            None,
+        )
+
+    def get_month(
+        self, month: date, include: Callable[[str], bool]
+    ) -> MonthlyUsage | None:
+        """Return the month's total over the included subscribers, if any."""
+        month = month.replace(day=1)
+        totals = [
+            (subscriber, total)
+            for (subscriber, total_month), total in self._totals.items()
+            if total_month == month and include(subscriber)
+        ]
+        if not totals:
+            return None
+        subscriber = totals[0][0]
+        mone = next(
+            (
+                record.mone
+                for (record_subscriber, _), record in self._days.items()
+                if record_subscriber == subscriber
+            ),
+            None,
+        )
+        return MonthlyUsage(
+            subscriber=subscriber,
+            mone=mone,
+            usage_month=datetime.combine(month, time()),
+            sum_all_month=sum(total for _, total in totals),
+        )
+
+    def _prune(self, first_month: date) -> None:
+        if self._first_month == first_month:
+            return
+        self._first_month = first_month
+        for key in [key for key in self._days if key[1] < first_month]:
+            del self._days[key]
+        for key in [key for key in self._totals if key[1] < first_month]:
+            del self._totals[key]
+
+    def as_diagnostics(self) -> dict[str, Any]:
+        """Return the series size for diagnostics."""
+        return {
+            "days": len(self._days),
+            "first_month": self._first_month.isoformat() if self._first_month else None,
+        }
@@ -0,0 +1,179 @@
+"""Streaming detection of abnormal consumption for bezeq_energy."""
+
+from __future__ import annotations
+
+import math
+from array import array
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    ANOMALY_MIN_SAMPLES,
+    ANOMALY_MIN_STD,
+    ANOMALY_SAVE_DELAY,
+    ANOMALY_STORAGE_VERSION,
+    ANOMALY_WINDOW_HOURS,
+    DOMAIN,
+)
+from .interval import get_slot_start
+from .tariff import WEEK_SLOTS, get_week_slot
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .interval import IntervalBuffer
+
+
+class WeekStatistics:
+    """Welford mean and variance of hourly kWh, per hour of the week."""
+
+    __slots__ = ("count", "m2", "mean")
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.count = array("l", [0]) * WEEK_SLOTS
+        self.mean = array("d", [0.0]) * WEEK_SLOTS
+        self.m2 = array("d", [0.0]) * WEEK_SLOTS
+
+    def add(self, week_slot: int, value: float) -> None:
+        """Fold one reading into its hour of the week."""
+        self.count[week_slot] += 1
+        delta = value - self.mean[week_slot]
+        self.mean[week_slot] += delta / self.count[week_slot]
+        self.m2[week_slot] += delta * (value - self.mean[week_slot])
+
+    def variance(self, week_slot: int) -> float:
+        """Return the sample variance of an hour of the week."""
+        count = self.count[week_slot]
+        return self.m2[week_slot] / (count - 1) if count > 1 else 0.0
+
+    def as_dict(self) -> dict[str, list]:
+        """Return the statistics for storage."""
+        return {
+            "count": self.count.tolist(),
+            "mean": self.mean.tolist(),
+            "m2": self.m2.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, stored: dict[str, list]) -> WeekStatistics:
+        """Restore statistics saved by `as_dict`."""
+        statistics = cls()
+        statistics.count = array("l", stored["count"])
+        statistics.mean = array("d", stored["mean"])
+        statistics.m2 = array("d", stored["m2"])
+        return statistics
+
+
+@dataclass(frozen=True, slots=True)
+class AnomalySummary:
+    """How far the latest hours are above what is usual for them."""
+
+    score: float
+    actual: float
+    expected: float
+    hours: int
+    window_end: str
+
+
+class AnomalyDetector:
+    """
+    Score the latest hourly readings against running statistics of past ones.
+
+    Every hour of the week keeps a Welford mean and variance, persisted with a
+    watermark, so readings are folded in once as they age out of the scored
+    window and nothing is ever read back from the recorder. The score is the
+    combined z-score of the last few known hours, so a heater left on for a
+    few hours stands out while a single spike does not.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, ANOMALY_STORAGE_VERSION, f"{DOMAIN}.anomaly_{entry_id}"
+        )
+        self._statistics: dict[str, WeekStatistics] = {}
+        self._folded_through: dict[str, int] = {}
+
+    async def async_load(self) -> None:
+        """Load the statistics from storage."""
+        if not (stored := await self._store.async_load()):
+            return
+        for subscriber, item in stored["subscribers"].items():
+            self._statistics[subscriber] = WeekStatistics.from_dict(item["statistics"])
+            self._folded_through[subscriber] = item["folded_through"]
+
+    def update(
+        self, subscriber: str, buffer: IntervalBuffer, *, complete: bool
+    ) -> AnomalySummary | None:
+        """
+        Fold readings that left the scored window, then score the window.
+
+        Folding waits until the buffer is `complete`, so a buffer still being
+        filled backwards doesn't leave a gap behind the watermark.
+        """
+        if (head := buffer.head) is None:
+            return None
+        statistics = self._statistics.setdefault(subscriber, WeekStatistics())
+        window_start = head - ANOMALY_WINDOW_HOURS + 1
+
+        if complete:
+            first = max(
+                self._folded_through.get(subscriber, -math.inf) + 1,
+                head - buffer.slots + 1,
+            )
+            folded = 0
+            for slot in range(int(first), window_start):
+                if not math.isnan(value := buffer.get(slot)):
+                    statistics.add(get_week_slot(get_slot_start(slot)), value)
+                    folded += 1
+            self._folded_through[subscriber] = window_start - 1
+            if folded:
+                self._store.async_delay_save(self._data_to_save, ANOMALY_SAVE_DELAY)
+
+        actual = expected = variance = 0.0
+        hours = 0
+        for slot in range(window_start, head + 1):
+            week_slot = get_week_slot(get_slot_start(slot))
+            if (
+                math.isnan(value := buffer.get(slot))
+                or statistics.count[week_slot] < ANOMALY_MIN_SAMPLES
+            ):
+                continue
+            actual += value
+            expected += statistics.mean[week_slot]
+            variance += max(statistics.variance(week_slot), ANOMALY_MIN_STD**2)
+            hours += 1
+        if not hours:
+            return None
+
+        return AnomalySummary(
+            score=(actual - expected) / math.sqrt(variance),
+            actual=actual,
+            expected=expected,
+            hours=hours,
+            window_end=get_slot_start(head + 1).isoformat(),
+        )
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return {
+            "subscribers": {
+                subscriber: {
+                    "statistics": statistics.as_dict(),
+                    "folded_through": self._folded_through.get(subscriber),
+                }
+                for subscriber, statistics in self._statistics.items()
+                if subscriber in self._folded_through
+            }
+        }
+
+    def as_diagnostics(self) -> dict[str, Any]:
+        """Return the detector state for diagnostics."""
+        return {
+            "subscribers": len(self._statistics),
+            "readings": sum(
+                sum(statistics.count) for statistics in self._statistics.values()
+            ),
+        }
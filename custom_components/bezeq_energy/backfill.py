@@ -0,0 +1,223 @@
+"""Resumable import of the full smart meter history."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, Any
+
+from dateutil.relativedelta import relativedelta
+from homeassistant.helpers.storage import Store
+from my_bezeq import (
+    ElectricReportLevel,
+    MyBezeqError,
+    MyBezeqLoginError,
+    MyBezeqUnauthorizedError,
+    MyBezeqVersionError,
+)
+
+from .const import (
+    BACKFILL_MAX_CONCURRENT_REQUESTS,
+    BACKFILL_MAX_HISTORY_YEARS,
+    BACKFILL_MAX_RETRY_DELAY,
+    BACKFILL_REQUESTS_PER_MINUTE,
+    BACKFILL_RETRY_DELAY,
+    BACKFILL_STORAGE_VERSION,
+    DEFAULT_REQUEST_TIMEOUT,
+    DOMAIN,
+    LOGGER,
+)
+from .throttle import AsyncRateLimiter
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .data import BezeqEnergyData
+    from .statistics import BezeqStatisticsImporter
+    from .usage_cache import UsageRecord
+
+
+class BezeqBackfill:
+    """
+    Import the smart meter history into long-term statistics.
+
+    The range is split into chunks the usage report endpoints can serve in one
+    request (a day of hourly data, a month of daily data). Chunks are fetched
+    with bounded concurrency under a request rate limit, then handed to the
+    statistics importer in order. Progress is saved after every chunk, so a
+    restart resumes where the last run stopped.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        runtime_data: BezeqEnergyData,
+        statistics: BezeqStatisticsImporter,
+    ) -> None:
+        """Initialize."""
+        self._client = runtime_data.account.client
+        self._session = runtime_data.account.session
+        self._usage_cache = runtime_data.usage_cache
+        self._statistics = statistics
+        self._coordinator = runtime_data.coordinator
+        self._store: Store[dict[str, Any]] = Store(
+            hass, BACKFILL_STORAGE_VERSION, f"{DOMAIN}.backfill_{entry_id}"
+        )
+        self._limiter = AsyncRateLimiter(BACKFILL_REQUESTS_PER_MINUTE)
+        self._fleet_limiter = runtime_data.fleet.limiter
+        self._semaphore = asyncio.Semaphore(BACKFILL_MAX_CONCURRENT_REQUESTS)
+        self.next: date | None = None
+        self.end: date | None = None
+        self.done = False
+        self.chunks_done = 0
+
+    async def async_load(self) -> None:
+        """Load progress from storage."""
+        if stored := await self._store.async_load():
+            self.done = stored["done"]
+            self.next = date.fromisoformat(stored["next"]) if stored["next"] else None
+            self.end = date.fromisoformat(stored["end"]) if stored["end"] else None
+        elif self._statistics.last_imported:
+            # Statistics were imported before backfill existed. Their running sums
+            # can't be rebased onto older history, so leave them be.
+            self.done = True
+
+    async def async_run(self, today: date) -> None:
+        """Backfill until the whole history is imported."""
+        if self.done:
+            return
+
+        try:
+            await self._async_run(today)
+        except (MyBezeqLoginError, MyBezeqVersionError) as exception:
+            # Retrying can't help and may lock the account. The coordinator hits
+            # the same error and reports it, starting reauth where it applies.
+            # Progress is saved, the next setup resumes from it.
+            LOGGER.warning("Backfill stopped: %s", exception)
+            await self._coordinator.async_request_refresh()
+
+    async def _async_run(self, today: date) -> None:
+        if self.next is None or self.end is None:
+            self.next = await self._async_find_history_start(today)
+            self.end = today
+            await self._async_save()
+            LOGGER.info("Backfilling usage statistics from %s", self.next)
+
+        while self.next <= self.end:
+            chunks = self._next_chunks()
+            usages = await asyncio.gather(
+                *(self._async_fetch_chunk(start, end) for start, end in chunks)
+            )
+            # Statistics carry a running sum, so chunks must land in order
+            for (_, end), usage in zip(chunks, usages, strict=True):
+                await self._statistics.async_add_usage(
+                    usage, self._coordinator.tariff, today
+                )
+                if self._statistics.level == ElectricReportLevel.HOURLY:
+                    # Recent history also fills the interval buffers for free
+                    self._coordinator.intervals.add_usage(usage, today)
+                self.next = end + timedelta(days=1)
+                self.chunks_done += 1
+                await self._async_save()
+
+        self.done = True
+        await self._async_save()
+        LOGGER.info("Finished backfilling usage statistics")
+
+    def _next_chunks(self) -> list[tuple[date, date]]:
+        chunks = []
+        start = self.next
+        while start <= self.end and len(chunks) < BACKFILL_MAX_CONCURRENT_REQUESTS:
+            if self._statistics.level == ElectricReportLevel.HOURLY:
+                end = start
+            else:
+                end = min(
+                    self.end, start.replace(day=1) + relativedelta(months=1, days=-1)
+                )
+            chunks.append((start, end))
+            start = end + timedelta(days=1)
+        return chunks
+
+    async def _async_find_history_start(self, today: date) -> date:
+        """Find the first month with usage, one year of monthly data at a time."""
+        history_start = today
+        for years_back in range(BACKFILL_MAX_HISTORY_YEARS):
+            end = today - relativedelta(years=years_back)
+            start = end - relativedelta(years=1, days=-1)
+            usages = await self._async_call(
+                self._usage_cache.async_get_usage,
+                self._client,
+                ElectricReportLevel.MONTHLY,
+                start,
+                end,
+            )
+            months = [
+                usage.usage_month.date() for usage in usages if usage.sum_all_month
+            ]
+            if not months:
+                break
+            history_start = min(months).replace(day=1)
+        return history_start
+
+    async def _async_fetch_chunk(
+        self, start: date, end: date
+    ) -> dict[date, list[UsageRecord]]:
+        return await self._async_call(
+            self._usage_cache.async_get_usage_by_period,
+            self._client,
+            self._statistics.level,
+            start,
+            end,
+            cache=False,
+        )
+
+    async def _async_call(self, fetch: Any, *args: Any, **kwargs: Any) -> Any:
+        """
+        Call the API under the rate limit, retrying until it succeeds.
+
+        Login and version errors aren't retried, they need the user.
+        """
+        delay = BACKFILL_RETRY_DELAY
+        unauthorized = 0
+        while True:
+            token = None
+            try:
+                async with self._semaphore, self._limiter, self._fleet_limiter:
+                    token = await self._session.async_ensure_session()
+                    async with asyncio.timeout(DEFAULT_REQUEST_TIMEOUT):
+                        return await fetch(*args, **kwargs)
+            except (MyBezeqLoginError, MyBezeqVersionError):
+                raise
+            except MyBezeqUnauthorizedError as exception:
+                await self._session.async_invalidate(token)
+                unauthorized += 1
+                if unauthorized == 1:
+                    # A token revoked before its expiry, log in again right away
+                    continue
+                failure: Exception = exception
+            except (MyBezeqError, TimeoutError) as exception:
+                failure = exception
+            LOGGER.warning(
+                "Backfill request failed, retrying in %s: %s", delay, failure
+            )
+            await asyncio.sleep(delay.total_seconds())
+            delay = min(delay * 2, BACKFILL_MAX_RETRY_DELAY)
+
+    async def _async_save(self) -> None:
+        await self._store.async_save(
+            {
+                "done": self.done,
+                "next": self.next.isoformat() if self.next else None,
+                "end": self.end.isoformat() if self.end else None,
+            }
+        )
+
+    def as_diagnostics(self) -> dict[str, Any]:
+        """Return backfill progress for diagnostics."""
+        return {
+            "done": self.done,
+            "next": self.next.isoformat() if self.next else None,
+            "end": self.end.isoformat() if self.end else None,
+            "chunks_done": self.chunks_done,
+        }
@@ -6,12 +6,16 @@ from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
 from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
     BinarySensorEntity,
     BinarySensorEntityDescription,
 )
 
-from custom_components.bezeq_energy.commons import get_last_invoice
-from custom_components.bezeq_energy.const import ELEC_INVOICE_KEY
+from custom_components.bezeq_energy.const import (
+    ANOMALY_THRESHOLD,
+    SECTION_ANOMALY,
+    SECTION_INVOICES,
+)
 
 from .entity import BezeqEnergyEntity, BezeqEnergyEntityDescriptionMixin
 
@@ -35,35 +39,46 @@ class BezeqEnergyBinarySensorEntityDescription(
 ENTITY_DESCRIPTIONS = [
     BezeqEnergyBinarySensorEntityDescription(
         key="is_last_invoice_paid",
+        section=SECTION_INVOICES,
+        value_fn=lambda data: data.last_invoice.is_payed if data.last_invoice else None,
+        custom_attrs_fn=lambda data: (
+            {
+                "invoice_number": data.last_invoice.invoice_number,
+                "sum": data.last_invoice.sum,
+                "date_period": data.last_invoice.date_period,
+            }
+            if data.last_invoice
+            else None
+        ),
+    ),
+]
+
+SMART_METER_ENTITY_DESCRIPTIONS = [
+    BezeqEnergyBinarySensorEntityDescription(
+        key="consumption_anomaly",
+        entry_scoped=True,
+        section=SECTION_ANOMALY,
+        device_class=BinarySensorDeviceClass.PROBLEM,
         value_fn=lambda data: (
-            get_last_invoice(data[ELEC_INVOICE_KEY].invoices).is_payed
-            if (
-                data[ELEC_INVOICE_KEY]
-                and get_last_invoice(data[ELEC_INVOICE_KEY].invoices)
-            )
+            data.consumption_anomaly.score >= ANOMALY_THRESHOLD
+            if data.consumption_anomaly
             else None
         ),
         custom_attrs_fn=lambda data: (
             {
-                "invoice_number": get_last_invoice(
-                    data[ELEC_INVOICE_KEY].invoices
-                ).invoice_number,
-                "sum": get_last_invoice(data[ELEC_INVOICE_KEY].invoices).sum,
-                "date_period": get_last_invoice(
-                    data[ELEC_INVOICE_KEY].invoices
-                ).date_period,
+                "score": round(data.consumption_anomaly.score, 2),
+                "actual_kwh": round(data.consumption_anomaly.actual, 3),
+                "expected_kwh": round(data.consumption_anomaly.expected, 3),
+                "hours": data.consumption_anomaly.hours,
+                "window_end": data.consumption_anomaly.window_end,
+                "threshold": ANOMALY_THRESHOLD,
             }
-            if (
-                data[ELEC_INVOICE_KEY]
-                and get_last_invoice(data[ELEC_INVOICE_KEY].invoices)
-            )
+            if data.consumption_anomaly
             else None
         ),
     ),
 ]
 
-SMART_METER_ENTITY_DESCRIPTIONS = []
-
 
 async def async_setup_entry(
     hass: HomeAssistant,  # noqa: ARG001 function argument: `hass`
@@ -71,7 +86,7 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the binary_sensor platform."""
-    entity_descriptions = ENTITY_DESCRIPTIONS
+    entity_descriptions = list(ENTITY_DESCRIPTIONS)
     if entry.runtime_data.device_info.is_smart_meter:
         entity_descriptions += SMART_METER_ENTITY_DESCRIPTIONS
 
@@ -98,20 +113,14 @@ class BezeqEnergyBinarySensor(BezeqEnergyEntity, BinarySensorEntity):
         super().__init__(coordinator, device_info)
         self.entity_description = entity_description
 
-        self._attr_unique_id = f"{entity_description.key}"
+        self._attr_unique_id = self.get_unique_id(
+            entity_description.key, entry_scoped=entity_description.entry_scoped
+        )
         self._attr_translation_key = f"{entity_description.key}"
 
-        attributes = {}
-        if self.entity_description.custom_attrs_fn:
-            custom_attr = self.entity_description.custom_attrs_fn(self.coordinator.data)
-            if custom_attr:
-                attributes.update(custom_attr)
-
-        self._attr_extra_state_attributes = attributes
-
     @property
     def is_on(self) -> bool:
         """Return true if the binary_sensor is on."""
-        if self.coordinator.data:
-            return self.entity_description.value_fn(self.coordinator.data)
+        if self.entity_data:
+            return self.entity_description.value_fn(self.entity_data)
         return False
@@ -0,0 +1,108 @@
+"""Circuit breaker for calls to the my.bezeq API."""
+
+from __future__ import annotations
+
+import math
+import random
+from enum import StrEnum
+from typing import TYPE_CHECKING, Any
+
+from .const import (
+    BREAKER_BASE_DELAY,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_LOGIN_COOL_OFF,
+    BREAKER_MAX_DELAY,
+    LOGGER,
+)
+
+if TYPE_CHECKING:
+    from datetime import datetime, timedelta
+
+
+class CircuitState(StrEnum):
+    """State of the circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Stop calling my.bezeq while it keeps failing.
+
+    After `failure_threshold` consecutive failures the circuit opens and calls are
+    skipped until the retry time, which backs off exponentially with jitter so
+    many accounts don't retry in lockstep. Login failures open the circuit at
+    once, for at least the login cool-off, to avoid hammering the login endpoint.
+    One trial call is let through when the retry time comes (half open); its
+    outcome closes the circuit or opens it again with a longer delay.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        base_delay: timedelta = BREAKER_BASE_DELAY,
+        max_delay: timedelta = BREAKER_MAX_DELAY,
+        login_cool_off: timedelta = BREAKER_LOGIN_COOL_OFF,
+    ) -> None:
+        """Initialize."""
+        self._failure_threshold = failure_threshold
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self._login_cool_off = login_cool_off
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.next_retry: datetime | None = None
+
+    def allow_request(self, now: datetime) -> bool:
+        """Return True if a call may be made at `now`."""
+        if self.state == CircuitState.OPEN and now >= self.next_retry:
+            LOGGER.debug("Circuit half open, letting a trial call through")
+            self.state = CircuitState.HALF_OPEN
+        return self.state != CircuitState.OPEN
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call."""
+        if self.state != CircuitState.CLOSED:
+            LOGGER.info("my.bezeq is reachable again, closing the circuit")
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.next_retry = None
+
+    def record_failure(self, now: datetime, *, login: bool = False) -> None:
+        """Count a failed call and open the circuit if needed."""
+        self.failures += 1
+        if (
+            not login
+            and self.state == CircuitState.CLOSED
+            and self.failures < self._failure_threshold
+        ):
+            return
+
+        # Cap the exponent too, weeks of failures must not overflow timedelta
+        doublings = min(
+            max(0, self.failures - self._failure_threshold),
+            math.ceil(math.log2(max(self._max_delay / self._base_delay, 1))),
+        )
+        delay = min(self._max_delay, self._base_delay * 2**doublings)
+        # Equal jitter: wait at least half the delay, spread the rest
+        delay = delay / 2 + delay / 2 * random.random()  # noqa: S311
+        if login:
+            delay = max(delay, self._login_cool_off)
+
+        self.state = CircuitState.OPEN
+        self.next_retry = now + delay
+        LOGGER.warning(
+            "my.bezeq failed %s times in a row, pausing calls until %s",
+            self.failures,
+            self.next_retry,
+        )
+
+    def as_diagnostics(self) -> dict[str, Any]:
+        """Return the breaker state for diagnostics."""
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "next_retry": self.next_retry.isoformat() if self.next_retry else None,
+        }
@@ -2,15 +2,24 @@
 
 from datetime import date
 
+import homeassistant.util.dt as dt_util
 from my_bezeq import BaseCardDetails, Invoice, ServiceType
 
+timezone = dt_util.get_time_zone("Asia/Jerusalem")
+
+
+def get_invoice_order(invoice: Invoice) -> tuple[int, str]:
+    """Return a sort key ordering invoice numbers numerically, "999" before "1000"."""
+    number = str(invoice.invoice_number).lstrip("0")
+    return len(number), number
+
 
 def get_last_invoice(invoices: list[Invoice]) -> Invoice | None:
     """Get the last invoice by InvoiceNumber."""
     if not invoices:
         return None
     # Sort invoices by InvoiceNumber and return the last one
-    sorted_invoices = sorted(invoices, key=lambda inv: inv.invoice_number)
+    sorted_invoices = sorted(invoices, key=get_invoice_order)
     return sorted_invoices[-1]
 
 
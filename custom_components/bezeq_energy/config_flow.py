@@ -5,6 +5,7 @@ from __future__ import annotations
 import voluptuous as vol
 from homeassistant import config_entries, data_entry_flow
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import callback
 from homeassistant.helpers import selector
 from homeassistant.helpers.aiohttp_client import async_create_clientsession
 from my_bezeq import (
@@ -21,9 +22,19 @@ from .const import (
     CONF_CONTRACT_NUMBER,
     CONF_COUNTER_NUMBER,
     CONF_IS_SMART_METER,
+    CONF_KWH_PRICE,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_REQUEST_TIMEOUT,
+    CONF_STATISTICS_LEVEL,
     CONF_SUBSCRIBER_NUMBER,
+    DEFAULT_KWH_PRICE,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_REQUEST_TIMEOUT,
+    DEFAULT_STATISTICS_LEVEL,
     DOMAIN,
     LOGGER,
+    STATISTICS_LEVEL_DAILY,
+    STATISTICS_LEVEL_HOURLY,
 )
 
 
@@ -32,6 +43,14 @@ class BezeqEnergyFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> BezeqEnergyOptionsFlowHandler:
+        """Get the options flow for this handler."""
+        return BezeqEnergyOptionsFlowHandler(config_entry)
+
     async def async_step_user(
         self,
         user_input: dict | None = None,
@@ -140,3 +159,77 @@ class BezeqEnergyFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             raise MyBezeqError(msg) from e
 
         return subscriber.subscriber, is_smart_meter, counter_number, contract_number
+
+
+class BezeqEnergyOptionsFlowHandler(config_entries.OptionsFlow):
+    """Options flow for Bezeq Energy."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize options flow."""
+        self.config_entry = config_entry
+
+    async def async_step_init(
+        self,
+        user_input: dict | None = None,
+    ) -> data_entry_flow.FlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_MAX_CONCURRENT_REQUESTS,
+                        default=options.get(
+                            CONF_MAX_CONCURRENT_REQUESTS,
+                            DEFAULT_MAX_CONCURRENT_REQUESTS,
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=1,
+                            max=10,
+                            mode=selector.NumberSelectorMode.BOX,
+                        ),
+                    ),
+                    vol.Required(
+                        CONF_REQUEST_TIMEOUT,
+                        default=options.get(
+                            CONF_REQUEST_TIMEOUT, DEFAULT_REQUEST_TIMEOUT
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=5,
+                            max=300,
+                            unit_of_measurement="s",
+                            mode=selector.NumberSelectorMode.BOX,
+                        ),
+                    ),
+                    vol.Required(
+                        CONF_KWH_PRICE,
+                        default=options.get(CONF_KWH_PRICE, DEFAULT_KWH_PRICE),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=0,
+                            max=10,
+                            step=0.0001,
+                            unit_of_measurement="₪/kWh",
+                            mode=selector.NumberSelectorMode.BOX,
+                        ),
+                    ),
+                    vol.Required(
+                        CONF_STATISTICS_LEVEL,
+                        default=options.get(
+                            CONF_STATISTICS_LEVEL, DEFAULT_STATISTICS_LEVEL
+                        ),
+                    ): selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            options=[STATISTICS_LEVEL_HOURLY, STATISTICS_LEVEL_DAILY],
+                            translation_key=CONF_STATISTICS_LEVEL,
+                        ),
+                    ),
+                },
+            ),
+        )
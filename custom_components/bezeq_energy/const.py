@@ -1,5 +1,6 @@
 """Constants for bezeq_energy."""
 
+from datetime import timedelta
 from logging import Logger, getLogger
 
 LOGGER: Logger = getLogger(__package__)
@@ -11,6 +12,17 @@ CONF_IS_SMART_METER = "is_smart_meter"
 CONF_COUNTER_NUMBER = "counter_number"
 CONF_CONTRACT_NUMBER = "contract_number"
 CONF_SUBSCRIBER_NUMBER = "subscriber_number"
+CONF_MAX_CONCURRENT_REQUESTS = "max_concurrent_requests"
+CONF_REQUEST_TIMEOUT = "request_timeout"
+CONF_STATISTICS_LEVEL = "statistics_level"
+CONF_KWH_PRICE = "kwh_price"
+DEFAULT_MAX_CONCURRENT_REQUESTS = 4
+DEFAULT_REQUEST_TIMEOUT = 60  # seconds
+STATISTICS_LEVEL_HOURLY = "hourly"
+STATISTICS_LEVEL_DAILY = "daily"
+DEFAULT_STATISTICS_LEVEL = STATISTICS_LEVEL_HOURLY
+# Residential rate in ₪ per kWh, VAT included
+DEFAULT_KWH_PRICE = 0.6402
 DAILY_USAGE_KEY = "daily_usage"
 MONTHLY_USAGE_KEY = "monthly_usage"
 IS_LAST_INVOICE_PAYED_KEY = "is_last_invoice_payed"
@@ -20,6 +32,109 @@ LAST_MONTH_INVOICE_KEY = "last_month_invoice"
 PAYER_DETAILS_KEY = "payer_details"
 MONTHLY_USED_KEY = "monthly_used"
 MY_PACKAGE_KEY = "my_package"
+TODAY_COST_KEY = "today_cost"
+THIS_MONTH_COST_KEY = "this_month_cost"
+TIME_OF_USE_KEY = "time_of_use"
+FORECAST_KEY = "forecast"
+ANOMALY_KEY = "consumption_anomaly"
 ELEC_INVOICE_KEY = "elec_invoice"
 ELEC_PAYER_KEY = "elec_payer"
 UNIT_ILS = "₪"
+ATTR_STALE = "stale"
+ATTR_LAST_SUCCESS = "last_success"
+ATTR_STALE_SINCE = "stale_since"
+
+SERVICE_GET_USAGE = "get_usage"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_LEVEL = "level"
+ATTR_START_DATE = "start_date"
+ATTR_END_DATE = "end_date"
+USAGE_LEVEL_HOURLY = "hourly"
+USAGE_LEVEL_DAILY = "daily"
+USAGE_LEVEL_MONTHLY = "monthly"
+# Records in one get_usage response, a longer range continues from next_start
+USAGE_SERVICE_MAX_RECORDS = 2000
+
+DATASET_DAILY_USAGE = "daily_usage"
+DATASET_MONTHLY_USAGE = "monthly_usage"
+DATASET_ELECTRICITY_TAB = "electricity_tab"
+DATASET_INVOICES = "invoices"
+DATASET_HOURLY_USAGE = "hourly_usage"
+
+SECTION_USAGE = "usage"
+SECTION_PACKAGE = "package"
+SECTION_PAYER = "payer"
+SECTION_INVOICES = "invoices"
+SECTION_COST = "cost"
+SECTION_FORECAST = "forecast"
+SECTION_ANOMALY = "anomaly"
+SUBSCRIBERS_KEY = "subscribers"
+
+SESSION_STORAGE_VERSION = 1
+SESSION_TOKEN_DEFAULT_TTL = timedelta(hours=12)
+SESSION_TOKEN_EXPIRY_MARGIN = timedelta(minutes=5)
+
+USAGE_CACHE_STORAGE_VERSION = 1
+USAGE_CACHE_SAVE_DELAY = 30  # seconds
+USAGE_CACHE_SETTLE_TIME = timedelta(days=2)
+# kWh a closed month may differ from its daily sum before the report wins
+USAGE_RECONCILE_TOLERANCE = 0.5
+
+STATISTICS_STORAGE_VERSION = 1
+# Only settled days are imported, start past the settle time
+STATISTICS_INITIAL_LOOKBACK = timedelta(days=4)
+STATISTICS_MAX_DAYS_PER_CYCLE = 7
+STATISTICS_REPAIR_MAX_DAYS_PER_CYCLE = 7
+
+# Weight of the newest day in the day-of-week profile of the forecast
+FORECAST_ALPHA = 0.2
+# Two-sided 90% confidence interval of the forecast
+FORECAST_CONFIDENCE = 0.9
+FORECAST_Z = 1.645
+
+INTERVAL_WINDOW = timedelta(days=90)
+INTERVAL_SLOT = timedelta(hours=1)
+INTERVAL_MAX_DAYS_PER_CYCLE = 3
+
+ANOMALY_STORAGE_VERSION = 1
+ANOMALY_SAVE_DELAY = 60  # seconds
+# The latest hours scored together, and the z-score they are abnormal above
+ANOMALY_WINDOW_HOURS = 3
+ANOMALY_THRESHOLD = 4.0
+# Readings an hour of the week needs before it is scored
+ANOMALY_MIN_SAMPLES = 4
+# kWh, keeps an hour that never varied from flagging any change at all
+ANOMALY_MIN_STD = 0.05
+
+BACKFILL_STORAGE_VERSION = 1
+BACKFILL_MAX_HISTORY_YEARS = 5
+BACKFILL_MAX_CONCURRENT_REQUESTS = 2
+BACKFILL_REQUESTS_PER_MINUTE = 12
+BACKFILL_RETRY_DELAY = timedelta(minutes=1)
+BACKFILL_MAX_RETRY_DELAY = timedelta(hours=1)
+
+# Closed periods cached per report level: the days and months of the whole
+# backfilled history plus the current year, and a year of hours
+USAGE_CACHE_MAX_ENTRIES = {
+    "HOURLY": 366,
+    "DAILY": (BACKFILL_MAX_HISTORY_YEARS + 1) * 366,
+    "MONTHLY": (BACKFILL_MAX_HISTORY_YEARS + 1) * 12,
+}
+
+INVOICE_LEDGER_STORAGE_VERSION = 1
+INVOICE_LEDGER_SAVE_DELAY = 10  # seconds
+
+SNAPSHOT_STORAGE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 10  # seconds
+
+BREAKER_FAILURE_THRESHOLD = 2
+BREAKER_BASE_DELAY = timedelta(hours=2)
+BREAKER_MAX_DELAY = timedelta(hours=12)
+BREAKER_LOGIN_COOL_OFF = timedelta(hours=6)
+
+FLEET_MAX_CONCURRENT_REFRESHES = 4
+FLEET_REQUESTS_PER_MINUTE = 60
+
+ACCOUNT_RESPONSE_TTL = 300  # seconds
+# Open periods change, a usage report is only shared by a burst of callers
+USAGE_REPORT_TTL = 60  # seconds
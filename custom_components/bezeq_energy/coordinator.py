@@ -2,13 +2,16 @@
 
 from __future__ import annotations
 
-import calendar
+import asyncio
 import logging
-from datetime import date, timedelta
+from datetime import UTC, datetime, timedelta
+from functools import partial
 from typing import TYPE_CHECKING, Any
 
 import homeassistant.util.dt as dt_util
 from dateutil.relativedelta import relativedelta
+from homeassistant.const import CONF_USERNAME
+from homeassistant.core import callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from my_bezeq import (
@@ -21,15 +24,31 @@ from my_bezeq import (
     ServiceType,
 )
 
+from .aggregation import DailyUsageSeries
+from .breaker import CircuitBreaker, CircuitState
 from .commons import (
     get_card_by_service_type,
-    translate_date_period,
+    timezone,
     translate_date_to_date_period,
 )
 from .const import (
+    ANOMALY_KEY,
+    CONF_KWH_PRICE,
+    CONF_SUBSCRIBER_NUMBER,
     DAILY_USAGE_KEY,
+    DATASET_DAILY_USAGE,
+    DATASET_ELECTRICITY_TAB,
+    DATASET_HOURLY_USAGE,
+    DATASET_INVOICES,
+    DATASET_MONTHLY_USAGE,
+    DEFAULT_KWH_PRICE,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_REQUEST_TIMEOUT,
     DOMAIN,
     ELEC_INVOICE_KEY,
+    FORECAST_KEY,
+    INTERVAL_MAX_DAYS_PER_CYCLE,
+    INTERVAL_SLOT,
     LAST_MONTH_INVOICE_KEY,
     LAST_MONTH_USAGE_KEY,
     LOGGER,
@@ -37,19 +56,61 @@ from .const import (
     MONTHLY_USED_KEY,
     MY_PACKAGE_KEY,
     PAYER_DETAILS_KEY,
+    SECTION_ANOMALY,
+    SECTION_COST,
+    SECTION_FORECAST,
+    SECTION_INVOICES,
+    SECTION_PACKAGE,
+    SECTION_PAYER,
+    SECTION_USAGE,
+    THIS_MONTH_COST_KEY,
+    TIME_OF_USE_KEY,
+    TODAY_COST_KEY,
+    USAGE_RECONCILE_TOLERANCE,
 )
+from .data import BezeqEnergyDeviceInfo, BezeqEnergySectionStatus
+from .forecast import UsageForecaster
+from .interval import IntervalStore
+from .scheduler import RefreshScheduler
+from .singleflight import SingleFlight
+from .snapshot import BezeqEnergySnapshot
+from .tariff import Tariff, compute_cost, parse_discount, parse_window
+from .tou import TimeOfUseTracker
+from .usage_cache import UsageRecord, is_closed_period
 
 if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+    from datetime import date
+
     from homeassistant.core import HomeAssistant
+    from my_bezeq import (
+        DailyUsage,
+        ElectricityMyPackageServiceCard,
+        MonthlyUsage,
+    )
 
+    from .account import BezeqAccount
     from .data import BezeqEnergyConfigEntry
+    from .session import BezeqSessionManager
 
-timezone = dt_util.get_time_zone("Asia/Jerusalem")
 _LOGGER = logging.getLogger(__name__)
 
+# Tick boundaries are counted from here, so they don't move across restarts
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+
+def get_subscriber_dataset(subscriber: str) -> str:
+    """Return the name of the electricity tab dataset of an extra subscriber."""
+    return f"{DATASET_ELECTRICITY_TAB}_{subscriber}"
+
+
+def get_section_id(section: str, subscriber: str | None = None) -> str:
+    """Return the id a section's status is kept under, per extra subscriber."""
+    return f"{section}_{subscriber}" if subscriber else section
+
 
 # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
-class BezeqElecDataUpdateCoordinator(DataUpdateCoordinator):
+class BezeqElecDataUpdateCoordinator(DataUpdateCoordinator[BezeqEnergySnapshot]):
     """Class to manage fetching data from the API."""
 
     config_entry: BezeqEnergyConfigEntry
@@ -57,126 +118,819 @@ class BezeqElecDataUpdateCoordinator(DataUpdateCoordinator):
     def __init__(
         self,
         hass: HomeAssistant,
+        max_concurrent_requests: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+        request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
     ) -> None:
         """Initialize."""
+        self._scheduler = RefreshScheduler()
+        self._breaker = CircuitBreaker()
         super().__init__(
             hass=hass,
             logger=LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(hours=1),
+            update_interval=self._scheduler.tick_interval,
+        )
+        self._datasets: dict[str, Any] = {}
+        self.sections: dict[str, BezeqEnergySectionStatus] = {}
+        self.data_updated_at: datetime | None = None
+        self.skipped_writes = 0
+        self._phase = timedelta(0)
+        self._daily_series = DailyUsageSeries()
+        self._intervals = IntervalStore()
+        self._time_of_use = TimeOfUseTracker(self._intervals)
+        self._forecaster = UsageForecaster()
+        self._flights = SingleFlight(hass)
+        self._max_concurrent_requests = int(max_concurrent_requests)
+        self._request_timeout = request_timeout
+
+    @property
+    def scheduler(self) -> RefreshScheduler:
+        """Return the per-dataset refresh scheduler."""
+        return self._scheduler
+
+    @property
+    def subscribers(self) -> dict[str, BezeqEnergyDeviceInfo]:
+        """Return the account's other electricity subscribers, by number."""
+        return {
+            subscriber: BezeqEnergyDeviceInfo(
+                is_smart_meter=not payer.have_mone_bsisi,
+                counter_number=payer.counter_number,
+                contract_number=payer.contract_number,
+                subscriber_number=subscriber,
+            )
+            for subscriber, snapshot in (
+                self.data.subscribers.items() if self.data else ()
+            )
+            if (payer := snapshot.payer_details)
+        }
+
+    @property
+    def daily_series(self) -> DailyUsageSeries:
+        """Return the daily usage series the monthly totals are summed from."""
+        return self._daily_series
+
+    @property
+    def intervals(self) -> IntervalStore:
+        """Return the window of hourly usage of every subscriber."""
+        return self._intervals
+
+    @property
+    def time_of_use(self) -> TimeOfUseTracker:
+        """Return the time-of-use buckets of every subscriber."""
+        return self._time_of_use
+
+    @property
+    def forecaster(self) -> UsageForecaster:
+        """Return the month-end forecaster of every subscriber."""
+        return self._forecaster
+
+    @property
+    def tariff(self) -> Tariff:
+        """Return the tariff of the entry's own subscriber."""
+        return self.get_tariff(self.data.my_package if self.data else None)
+
+    def get_tariff(self, package: ElectricityMyPackageServiceCard | None) -> Tariff:
+        """Return the configured price per kWh with a package's discount."""
+        return Tariff(
+            price=self.config_entry.options.get(CONF_KWH_PRICE, DEFAULT_KWH_PRICE),
+            discount=parse_discount(package.discount if package else None),
+            window=parse_window(package),
+        )
+
+    @property
+    def breaker(self) -> CircuitBreaker:
+        """Return the circuit breaker guarding the API calls."""
+        return self._breaker
+
+    async def _run_fetch_stage(
+        self, fetches: dict[str, Callable[[], Awaitable[Any]]]
+    ) -> tuple[dict[str, Any], dict[str, MyBezeqError]]:
+        """Run independent API calls concurrently, return results and errors by name."""
+        semaphore = asyncio.Semaphore(self._max_concurrent_requests)
+
+        async def _fetch(name: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+            async with semaphore, self.config_entry.runtime_data.fleet.limiter:
+                _LOGGER.debug("Fetching %s...", name)
+                try:
+                    async with asyncio.timeout(self._request_timeout):
+                        return await fetch()
+                except TimeoutError as exception:
+                    msg = f"Timed out fetching {name}"
+                    raise MyBezeqError(msg) from exception
+
+        # A failing or slow endpoint must not take the others down with it
+        outcomes = await asyncio.gather(
+            *(_fetch(name, fetch) for name, fetch in fetches.items()),
+            return_exceptions=True,
         )
 
-    async def _get_data(self):  # noqa: ANN202
-        api: MyBezeqAPI = self.config_entry.runtime_data.client
-        is_smart_meter = self.config_entry.runtime_data.device_info.is_smart_meter
+        results: dict[str, Any] = {}
+        errors: dict[str, MyBezeqError] = {}
+        for name, outcome in zip(fetches, outcomes, strict=True):
+            if isinstance(outcome, MyBezeqError):
+                errors[name] = outcome
+            elif isinstance(outcome, BaseException):
+                raise outcome
+            else:
+                results[name] = outcome
+        return results, errors
 
-        _LOGGER.debug("Logging in to my.bezeq.co.il")
-        await api.login()
-        _LOGGER.debug("Successfully logged in to my.bezeq.co.il. Getting dashboard...")
-        await api.dashboard.get_dashboard_tab()
+    async def _get_data(self) -> tuple[BezeqEnergySnapshot, bool]:
+        """Refresh the due datasets, return the data and whether any was fetched."""
+        account: BezeqAccount = self.config_entry.runtime_data.account
+        api: MyBezeqAPI = account.client
+        device_info = self.config_entry.runtime_data.device_info
+        is_smart_meter = device_info.is_smart_meter
+        primary = device_info.subscriber_number
 
-        today = dt_util.now(timezone).date()
-        last_day_of_month = calendar.monthrange(today.year, today.month)[1]
+        session: BezeqSessionManager = account.session
 
-        data = {}
+        now = dt_util.now(timezone)
+        today = now.date()
         last_month: date = today + relativedelta(months=-1)
 
-        if is_smart_meter:
-            _LOGGER.debug("Fetching electricity monthly usage...")
-            monthly_usages = (
-                await api.electric.get_elec_usage_report(
-                    ElectricReportLevel.MONTHLY,
-                    last_month.replace(day=1),
-                    today.replace(day=last_day_of_month),
+        # Once logged in, the tabs and usage reports don't depend on each other.
+        # Tabs are per account, entries sharing the login share the responses.
+        fetchers: dict[str, Callable[[], Awaitable[Any]]] = {
+            DATASET_ELECTRICITY_TAB: partial(
+                account.async_get_response,
+                get_subscriber_dataset(primary),
+                partial(api.electric.get_electricity_tab, primary),
+            ),
+            DATASET_INVOICES: partial(
+                account.async_get_response,
+                DATASET_INVOICES,
+                api.invoices.get_electric_invoice_tab,
+            ),
+        }
+        if is_smart_meter or any(
+            info.is_smart_meter for info in self.subscribers.values()
+        ):
+            # Settled days come from the cache, so once warm only the last few
+            # days of last month and this month's open days hit the API
+            usage_cache = self.config_entry.runtime_data.usage_cache
+            fetchers[DATASET_DAILY_USAGE] = partial(
+                usage_cache.async_get_usage,
+                api,
+                ElectricReportLevel.DAILY,
+                last_month.replace(day=1),
+                today,
+            )
+            # Only reconciles the totals summed from the daily series
+            fetchers[DATASET_MONTHLY_USAGE] = partial(
+                usage_cache.async_get_usage,
+                api,
+                ElectricReportLevel.MONTHLY,
+                last_month,
+                today,
+            )
+            fetchers[DATASET_HOURLY_USAGE] = partial(
+                self._async_fetch_intervals, api, today
+            )
+
+        due = self._scheduler.due(now)
+        fetches = {
+            dataset: fetch for dataset, fetch in fetchers.items() if dataset in due
+        }
+
+        failed: dict[str, MyBezeqError] = {}
+        if fetches:
+            token = await session.async_ensure_session()
+            results, failed = await self._run_fetch_stage(fetches)
+            if any(
+                isinstance(exception, MyBezeqUnauthorizedError)
+                for exception in failed.values()
+            ):
+                # The token was revoked before its expiry, log in once and retry
+                _LOGGER.debug("my.bezeq session was rejected, logging in again")
+                await session.async_invalidate(token)
+                await session.async_ensure_session()
+                retried, failed = await self._run_fetch_stage(
+                    {dataset: fetches[dataset] for dataset in failed}
                 )
-            ).usage_data
+                results.update(retried)
 
-            data[MONTHLY_USAGE_KEY] = next(
-                (
-                    usage
-                    for usage in monthly_usages
-                    if usage.usage_month.month == today.month
-                ),
-                None,
+            if failed and not results:
+                # Nothing got through, surface the error as a failed update
+                raise next(iter(failed.values()))
+
+            for dataset, exception in failed.items():
+                # Not marked as fetched, so only this dataset is retried next tick
+                _LOGGER.warning("Failed to fetch %s: %s", dataset, exception)
+
+            for dataset in results:
+                self._scheduler.mark_fetched(dataset, now)
+            if (hourly := results.pop(DATASET_HOURLY_USAGE, None)) is not None:
+                # Kept as floats in the interval buffers, not as records
+                self._intervals.add_usage(hourly, today)
+            self._datasets.update(results)
+
+            if DATASET_DAILY_USAGE in results:
+                changed = self._daily_series.update(results[DATASET_DAILY_USAGE], today)
+                _LOGGER.debug("%s days of usage changed", changed)
+                self._forecaster.update(self._daily_series, today)
+
+            if DATASET_ELECTRICITY_TAB in results:
+                failed.update(await self._async_fetch_subscriber_tabs(account, primary))
+
+            if DATASET_DAILY_USAGE in results:
+                await self._async_import_statistics(api, today)
+        else:
+            _LOGGER.debug("No dataset is due for a refresh")
+
+        data = self._build_data(
+            now, failed, primary=primary, is_smart_meter=is_smart_meter
+        )
+        # Fetches that all failed have raised, so any fetch means some succeeded
+        return data, bool(fetches)
+
+    def _get_other_subscribers(self, primary: str | None) -> list[str]:
+        """Return the account's subscribers other than the entry's own."""
+        if (elec_tab := self._datasets.get(DATASET_ELECTRICITY_TAB)) is None:
+            return list(self.data.subscribers) if self.data else []
+        primary = primary or elec_tab.subscriber_number
+        return [
+            subscriber.subscriber
+            for subscriber in elec_tab.elect_subscribers
+            if subscriber.subscriber != primary
+        ]
+
+    def _get_extra_subscribers(self, others: list[str]) -> list[str]:
+        """
+        Return the other subscribers this entry adds devices for.
+
+        Entries sharing a login see the same subscribers, so only the first of
+        them adds the ones that have no entry of their own.
+        """
+        username = self.config_entry.data.get(CONF_USERNAME)
+        entries = [
+            entry
+            for entry in self.hass.config_entries.async_entries(DOMAIN)
+            if entry.data.get(CONF_USERNAME) == username and entry.disabled_by is None
+        ]
+        entry_id = self.config_entry.entry_id
+        if min((entry.entry_id for entry in entries), default=entry_id) != entry_id:
+            return []
+        own = {entry.data.get(CONF_SUBSCRIBER_NUMBER) for entry in entries}
+        return [subscriber for subscriber in others if subscriber not in own]
+
+    async def _async_fetch_subscriber_tabs(
+        self, account: BezeqAccount, primary: str | None
+    ) -> dict[str, MyBezeqError]:
+        """Fetch the electricity tab of every other subscriber, in parallel."""
+        fetches: dict[str, Callable[[], Awaitable[Any]]] = {
+            get_subscriber_dataset(subscriber): partial(
+                account.async_get_response,
+                get_subscriber_dataset(subscriber),
+                partial(account.client.electric.get_electricity_tab, subscriber),
+            )
+            for subscriber in self._get_extra_subscribers(
+                self._get_other_subscribers(primary)
+            )
+        }
+        if not fetches:
+            return {}
+
+        results, failed = await self._run_fetch_stage(fetches)
+        for dataset, exception in failed.items():
+            _LOGGER.warning("Failed to fetch %s: %s", dataset, exception)
+        self._datasets.update(results)
+        return failed
+
+    async def _async_fetch_intervals(
+        self, api: MyBezeqAPI, today: date
+    ) -> dict[date, list[UsageRecord]]:
+        """Fetch hourly usage of the open days and of a few days still missing."""
+        # Yesterday's last readings arrive after midnight, refresh it with today
+        days = {today, today - timedelta(days=1)}
+        days.update(self._intervals.missing_days(today)[:INTERVAL_MAX_DAYS_PER_CYCLE])
+
+        usage_cache = self.config_entry.runtime_data.usage_cache
+        limiter = self.config_entry.runtime_data.fleet.limiter
+        usage: dict[date, list[UsageRecord]] = {}
+        for index, day in enumerate(sorted(days, reverse=True)):
+            if index:
+                # The fetch stage only paid for the first request
+                await limiter.acquire()
+            usage |= await usage_cache.async_get_usage_by_period(
+                api, ElectricReportLevel.HOURLY, day, day
             )
+        return usage
+
+    async def _async_import_statistics(self, api: MyBezeqAPI, today: date) -> None:
+        """Import new usage into long-term statistics, without failing the refresh."""
+        if not (statistics := self.config_entry.runtime_data.statistics):
+            return
+        if (backfill := self.config_entry.runtime_data.backfill) and not backfill.done:
+            # The backfill owns the watermark until it catches up to today
+            return
+        try:
+            await statistics.async_import(api, today, self.tariff)
+            if statistics.missing:
+                # Holes an outage left behind the watermark, a few days a cycle
+                await statistics.async_repair(api, today, self.tariff)
+        except MyBezeqError as exception:
+            _LOGGER.warning("Failed to import usage statistics: %s", exception)
+
+    def _build_data(
+        self,
+        now: datetime,
+        failed: dict[str, MyBezeqError],
+        *,
+        primary: str | None,
+        is_smart_meter: bool,
+    ) -> BezeqEnergySnapshot:
+        """
+        Build the coordinator data from the latest response of every dataset.
 
-            data[LAST_MONTH_USAGE_KEY] = next(
-                (
-                    usage
-                    for usage in monthly_usages
-                    if usage.usage_month.month == last_month.month
+        Each section is built and validated on its own. A section that fails keeps
+        its last good value and is marked stale, so one broken endpoint doesn't
+        turn every entity unavailable. The entry's own subscriber is at the top
+        level, the account's other subscribers each get a snapshot of their own.
+        """
+        today = now.date()
+        # Every other subscriber's records are left out of the entry's own usage,
+        # but only those this entry adds devices for get a snapshot
+        others = self._get_other_subscribers(primary)
+        extras = self._get_extra_subscribers(others)
+        # The monthly report only reconciles, failing it doesn't stale usage
+        usage_datasets = (DATASET_DAILY_USAGE,)
+
+        previous: BezeqEnergySnapshot | None = self.data
+        data = previous.as_dict() if previous else {}
+        subscriber_data = {
+            subscriber: previous.subscribers[subscriber].as_dict()
+            if previous and subscriber in previous.subscribers
+            else {}
+            for subscriber in extras
+        }
+
+        builders: dict[
+            str,
+            tuple[Callable[[], dict[str, Any]], tuple[str, ...], dict[str, Any]],
+        ] = {
+            SECTION_USAGE: (
+                partial(
+                    self._build_usage_section,
+                    today,
+                    is_smart_meter=is_smart_meter,
+                    excluded=others,
+                ),
+                usage_datasets if is_smart_meter else (),
+                data,
+            ),
+            SECTION_PACKAGE: (
+                partial(
+                    self._build_package_section,
+                    DATASET_ELECTRICITY_TAB,
+                    is_smart_meter=is_smart_meter,
                 ),
-                None,
+                (DATASET_ELECTRICITY_TAB,),
+                data,
+            ),
+            SECTION_PAYER: (
+                partial(self._build_payer_section, DATASET_ELECTRICITY_TAB),
+                (DATASET_ELECTRICITY_TAB,),
+                data,
+            ),
+            SECTION_COST: (
+                partial(
+                    self._build_cost_section,
+                    now,
+                    data,
+                    is_smart_meter=is_smart_meter,
+                    excluded=others,
+                ),
+                (DATASET_HOURLY_USAGE,) if is_smart_meter else (),
+                data,
+            ),
+            SECTION_FORECAST: (
+                partial(
+                    self._build_forecast_section,
+                    today,
+                    data,
+                    is_smart_meter=is_smart_meter,
+                    excluded=others,
+                ),
+                usage_datasets if is_smart_meter else (),
+                data,
+            ),
+            SECTION_ANOMALY: (
+                partial(
+                    self._build_anomaly_section,
+                    today,
+                    is_smart_meter=is_smart_meter,
+                    excluded=others,
+                ),
+                (DATASET_HOURLY_USAGE,) if is_smart_meter else (),
+                data,
+            ),
+            SECTION_INVOICES: (
+                partial(self._build_invoices_section, today),
+                (DATASET_INVOICES,),
+                data,
+            ),
+        }
+        subscribers = self.subscribers
+        for subscriber in extras:
+            dataset = get_subscriber_dataset(subscriber)
+            values = subscriber_data[subscriber]
+            smart_meter = (
+                info.is_smart_meter
+                if (info := subscribers.get(subscriber))
+                else is_smart_meter
             )
+            builders |= {
+                get_section_id(SECTION_USAGE, subscriber): (
+                    partial(
+                        self._build_usage_section,
+                        today,
+                        is_smart_meter=smart_meter,
+                        subscriber=subscriber,
+                    ),
+                    usage_datasets if smart_meter else (),
+                    values,
+                ),
+                get_section_id(SECTION_PACKAGE, subscriber): (
+                    partial(
+                        self._build_package_section,
+                        dataset,
+                        is_smart_meter=smart_meter,
+                    ),
+                    (dataset,),
+                    values,
+                ),
+                get_section_id(SECTION_PAYER, subscriber): (
+                    partial(self._build_payer_section, dataset),
+                    (dataset,),
+                    values,
+                ),
+                get_section_id(SECTION_COST, subscriber): (
+                    partial(
+                        self._build_cost_section,
+                        now,
+                        values,
+                        is_smart_meter=smart_meter,
+                        subscriber=subscriber,
+                    ),
+                    (DATASET_HOURLY_USAGE,) if smart_meter else (),
+                    values,
+                ),
+                get_section_id(SECTION_FORECAST, subscriber): (
+                    partial(
+                        self._build_forecast_section,
+                        today,
+                        values,
+                        is_smart_meter=smart_meter,
+                        subscriber=subscriber,
+                    ),
+                    usage_datasets if smart_meter else (),
+                    values,
+                ),
+            }
 
-            tomorrow = today + timedelta(days=1)
-            _LOGGER.debug("Fetching electricity today usage...")
-            daily_usages = (
-                await api.electric.get_elec_usage_report(
-                    ElectricReportLevel.DAILY, today, tomorrow
+        errors: list[Exception] = []
+        for section, (build, datasets, values) in builders.items():
+            status = self.sections.setdefault(section, BezeqEnergySectionStatus())
+            if exception := next(
+                (failed[dataset] for dataset in datasets if dataset in failed), None
+            ):
+                status.mark_failed(now, exception)
+                errors.append(exception)
+                continue
+
+            try:
+                built = build()
+            except (AttributeError, KeyError, ValueError) as exception:
+                _LOGGER.warning(
+                    "Failed to build the %s section: %s", section, exception
+                )
+                status.mark_failed(now, exception)
+                errors.append(exception)
+            else:
+                # The models compare by value, so an unchanged response keeps
+                # the section's version and its entities skip the state write
+                changed = any(
+                    key not in values or values[key] != value
+                    for key, value in built.items()
                 )
-            ).usage_data
+                values.update(built)
+                status.mark_success(now, changed=changed)
 
-            data[DAILY_USAGE_KEY] = next(
-                (usage for usage in daily_usages if usage.usage_day.date() == today),
-                None,
-            )
+        if len(errors) == len(builders):
+            msg = f"No section of the data could be built: {errors[0]}"
+            raise UpdateFailed(msg)
 
-        else:
-            data[MONTHLY_USAGE_KEY] = None
-            data[LAST_MONTH_USAGE_KEY] = None
-            data[DAILY_USAGE_KEY] = None
-
-        _LOGGER.debug("Fetching electricity tab...")
-        elec_tab = await api.electric.get_electricity_tab()
-        data[PAYER_DETAILS_KEY] = get_card_by_service_type(
-            elec_tab.cards, ServiceType.ELECTRICITY_PAYER
+        return BezeqEnergySnapshot(
+            data,
+            subscribers={
+                subscriber: BezeqEnergySnapshot(values)
+                for subscriber, values in subscriber_data.items()
+            },
+            invoices=self.config_entry.runtime_data.invoice_ledger.view(today),
+        )
+
+    @staticmethod
+    def _includes(
+        subscriber: str | None, excluded: list[str], record_subscriber: str
+    ) -> bool:
+        """Return True for a subscriber's records, or those of no excluded one."""
+        if subscriber:
+            return record_subscriber == subscriber
+        return record_subscriber not in excluded
+
+    def _build_usage_section(
+        self,
+        today: date,
+        *,
+        is_smart_meter: bool,
+        subscriber: str | None = None,
+        excluded: list[str] | None = None,
+    ) -> dict[str, Any]:
+        if not is_smart_meter:
+            return {
+                MONTHLY_USAGE_KEY: None,
+                LAST_MONTH_USAGE_KEY: None,
+                DAILY_USAGE_KEY: None,
+            }
+
+        last_month: date = today + relativedelta(months=-1)
+        include = partial(self._includes, subscriber, excluded or [])
+        return {
+            MONTHLY_USAGE_KEY: self._reconcile_month(today, include, today),
+            LAST_MONTH_USAGE_KEY: self._reconcile_month(last_month, include, today),
+            DAILY_USAGE_KEY: self._daily_series.get_day(today, include),
+        }
+
+    def _reconcile_month(
+        self, month: date, include: Callable[[str], bool], today: date
+    ) -> MonthlyUsage | None:
+        """Return a month's usage summed from the daily series, or as reported."""
+        month = month.replace(day=1)
+        summed = self._daily_series.get_month(month, include)
+        reported = next(
+            (
+                usage
+                for usage in self._datasets.get(DATASET_MONTHLY_USAGE) or []
+                if usage.usage_month.date().replace(day=1) == month
+                and include(usage.subscriber)
+            ),
+            None,
         )
+        if reported is None or (
+            summed is not None
+            and not is_closed_period(ElectricReportLevel.MONTHLY, month, today)
+        ):
+            # The report of an open month may lag behind the daily series
+            return summed
+        if summed is None:
+            return reported
+        if abs(reported.sum_all_month - summed.sum_all_month) > (
+            USAGE_RECONCILE_TOLERANCE
+        ):
+            # Days may be missing or corrected since, the settled report wins
+            _LOGGER.debug(
+                "Usage of %s is %s kWh, but its days sum up to %s kWh",
+                month,
+                reported.sum_all_month,
+                summed.sum_all_month,
+            )
+            return reported
+        return summed
+
+    def _build_cost_section(
+        self,
+        now: datetime,
+        values: dict[str, Any],
+        *,
+        is_smart_meter: bool,
+        subscriber: str | None = None,
+        excluded: list[str] | None = None,
+    ) -> dict[str, Any]:
+        if not is_smart_meter:
+            return {
+                TODAY_COST_KEY: None,
+                THIS_MONTH_COST_KEY: None,
+                TIME_OF_USE_KEY: None,
+            }
+
+        # The package section is built first, its discount applies to the cost
+        tariff = self.get_tariff(values.get(MY_PACKAGE_KEY))
+        include = partial(self._includes, subscriber, excluded or [])
+        day_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        month_start = day_start.replace(day=1)
+        end = now + INTERVAL_SLOT
+        record_subscriber = self._intervals.find_subscriber(include)
+        return {
+            TODAY_COST_KEY: compute_cost(
+                tariff, self._intervals.series(include, day_start, end), day_start
+            ),
+            THIS_MONTH_COST_KEY: compute_cost(
+                tariff, self._intervals.series(include, month_start, end), month_start
+            ),
+            TIME_OF_USE_KEY: self._time_of_use.get_summary(
+                record_subscriber, tariff, now
+            )
+            if record_subscriber
+            else None,
+        }
 
-        data[MY_PACKAGE_KEY] = get_card_by_service_type(
-            elec_tab.cards, ServiceType.ELECTRICITY_MY_PACKAGE_SERVICE
+    def _build_forecast_section(
+        self,
+        today: date,
+        values: dict[str, Any],
+        *,
+        is_smart_meter: bool,
+        subscriber: str | None = None,
+        excluded: list[str] | None = None,
+    ) -> dict[str, Any]:
+        include = partial(self._includes, subscriber, excluded or [])
+        record_subscriber = next(
+            (
+                candidate
+                for candidate in self._daily_series.subscribers
+                if include(candidate)
+            ),
+            None,
         )
+        # Built after the usage section, this month's usage is already summed
+        monthly_usage: MonthlyUsage | None = values.get(MONTHLY_USAGE_KEY)
+        if not is_smart_meter or record_subscriber is None or monthly_usage is None:
+            return {FORECAST_KEY: None}
+
+        daily_usage: DailyUsage | None = values.get(DAILY_USAGE_KEY)
+        return {
+            FORECAST_KEY: self._forecaster.forecast(
+                record_subscriber,
+                today,
+                monthly_usage.sum_all_month or 0.0,
+                (daily_usage.sum_all_day or 0.0) if daily_usage else 0.0,
+                self.get_tariff(values.get(MY_PACKAGE_KEY)),
+            )
+        }
+
+    def _build_anomaly_section(
+        self, today: date, *, is_smart_meter: bool, excluded: list[str]
+    ) -> dict[str, Any]:
+        detector = self.config_entry.runtime_data.anomaly_detector
+        include = partial(self._includes, None, excluded)
+        if (
+            not is_smart_meter
+            or detector is None
+            or (record_subscriber := self._intervals.find_subscriber(include)) is None
+        ):
+            return {ANOMALY_KEY: None}
+
+        return {
+            ANOMALY_KEY: detector.update(
+                record_subscriber,
+                self._intervals.find(include),
+                # Fold past readings only once the whole window is loaded
+                complete=not self._intervals.missing_days(today),
+            )
+        }
 
-        if is_smart_meter:
-            data[MONTHLY_USED_KEY] = get_card_by_service_type(
+    def _build_package_section(
+        self, dataset: str, *, is_smart_meter: bool
+    ) -> dict[str, Any]:
+        elec_tab = self._datasets[dataset]
+        return {
+            MY_PACKAGE_KEY: get_card_by_service_type(
+                elec_tab.cards, ServiceType.ELECTRICITY_MY_PACKAGE_SERVICE
+            ),
+            MONTHLY_USED_KEY: get_card_by_service_type(
                 elec_tab.cards, ServiceType.ELECTRICITY_MONTHLY_USED
             )
-        else:
-            data[MONTHLY_USED_KEY] = None
+            if is_smart_meter
+            else None,
+        }
 
-        #  This is not required since all the data is already in DeviceInfo
-        # data[ELEC_PAYER_KEY] = get_card_by_service_type(
-        #     elec_tab.cards, ServiceType.ELECTRICITY_PAYER)
+    def _build_payer_section(self, dataset: str) -> dict[str, Any]:
+        #  The payer details are also in DeviceInfo, but may change over time
+        elec_tab = self._datasets[dataset]
+        return {
+            PAYER_DETAILS_KEY: get_card_by_service_type(
+                elec_tab.cards, ServiceType.ELECTRICITY_PAYER
+            )
+        }
 
-        elec_invoices_tab = await api.invoices.get_electric_invoice_tab()
+    def _build_invoices_section(self, today: date) -> dict[str, Any]:
+        last_month: date = today + relativedelta(months=-1)
+        elec_invoices_tab = self._datasets[DATASET_INVOICES]
         invoice_data = get_card_by_service_type(
             elec_invoices_tab.cards, ServiceType.INVOICES
         )
-        data[ELEC_INVOICE_KEY] = invoice_data
 
-        data[LAST_MONTH_INVOICE_KEY] = next(
-            (
-                invoice
-                for invoice in invoice_data.invoices
-                if invoice_data
-                and invoice_data.invoices
-                and translate_date_period(invoice.date_period)
-                == translate_date_to_date_period(last_month)
-            ),
-            None,
-        )
+        ledger = self.config_entry.runtime_data.invoice_ledger
+        ledger.merge(invoice_data.invoices)
 
-        return data
+        return {
+            ELEC_INVOICE_KEY: invoice_data,
+            LAST_MONTH_INVOICE_KEY: ledger.get_month(
+                translate_date_to_date_period(last_month)
+            ),
+        }
 
-    async def _async_update_data(self) -> Any:
+    async def _async_update_data(self) -> BezeqEnergySnapshot:
         """Update data via library."""
+        # A manual refresh overlapping the scheduled one joins it, not the API
+        return await self._flights.async_call("refresh", self._async_refresh_data)
+
+    async def _async_refresh_data(self) -> BezeqEnergySnapshot:
+        now = dt_util.utcnow()
+        if not self._breaker.allow_request(now):
+            self._update_interval_from_breaker(now)
+            if self.data is not None:
+                # Keep serving the last data, entities report it as stale
+                _LOGGER.debug(
+                    "Circuit is open, skipping refresh until %s",
+                    self._breaker.next_retry,
+                )
+                return self.data
+            msg = f"my.bezeq is failing, next retry at {self._breaker.next_retry}"
+            raise UpdateFailed(msg)
+
         try:
-            return await self._get_data()
+            # Wait for a fleet-wide refresh slot, stalest entries go first
+            async with self.config_entry.runtime_data.fleet.async_refresh_slot(
+                self.data_updated_at
+            ):
+                data, fetched = await self._get_data()
         except MyBezeqVersionError as exception:
             raise ConfigEntryAuthFailed(exception) from exception
         except MyBezeqLoginError as exception:
+            self._breaker.record_failure(now, login=True)
+            self._update_interval_from_breaker(now)
             raise UpdateFailed(exception) from exception
         except MyBezeqUnauthorizedError as exception:
             raise ConfigEntryAuthFailed(exception) from exception
         except MyBezeqError as exception:
+            self._breaker.record_failure(now)
+            self._update_interval_from_breaker(now)
             raise UpdateFailed(exception) from exception
+
+        self._breaker.record_success()
+        self._update_interval_from_breaker(now)
+        if fetched:
+            # A tick with nothing due leaves the data as old as it was
+            self.data_updated_at = dt_util.utcnow()
+            self.config_entry.runtime_data.snapshot_store.async_save(
+                data, self.data_updated_at
+            )
+        return data
+
+    async def async_shutdown(self) -> None:
+        """Cancel a refresh still in flight, then shut the coordinator down."""
+        self._flights.async_cancel()
+        await super().async_shutdown()
+
+    @callback
+    def async_set_phase(self, phase: timedelta) -> None:
+        """Poll at `phase` past every tick boundary from now on."""
+        self._phase = phase
+        self.update_interval = self._get_phase_delay(dt_util.utcnow())
+
+    def _get_phase_delay(self, now: datetime) -> timedelta:
+        """Return how long until the next tick boundary of this entry's phase."""
+        interval = self._scheduler.tick_interval
+        delay = interval - (now - _EPOCH - self._phase) % interval
+        # A refresh ending right on a boundary polls on the next one
+        return delay if delay >= timedelta(seconds=1) else delay + interval
+
+    def _update_interval_from_breaker(self, now: datetime) -> None:
+        """Poll again when the circuit half opens, or on the next tick boundary."""
+        if self._breaker.state == CircuitState.OPEN:
+            self.update_interval = max(
+                self._breaker.next_retry - now, timedelta(seconds=1)
+            )
+        else:
+            # Measured from the end of the refresh, so slow ones don't drift
+            self.update_interval = self._get_phase_delay(dt_util.utcnow())
+
+    async def async_restore_snapshot(self) -> bool:
+        """Seed the coordinator with the data persisted by the last good refresh."""
+        if not (
+            snapshot := await self.config_entry.runtime_data.snapshot_store.async_load()
+        ):
+            return False
+
+        data, self.data_updated_at = snapshot
+        # The invoice ledger is persisted on its own, attach its view again
+        self.data = BezeqEnergySnapshot(
+            data.as_dict(),
+            subscribers=data.subscribers,
+            invoices=self.config_entry.runtime_data.invoice_ledger.view(
+                dt_util.now(timezone).date()
+            ),
+        )
+        _LOGGER.debug("Restored coordinator data from %s", self.data_updated_at)
+        return True
+
+    @property
+    def is_stale(self) -> bool:
+        """Return True if the data missed at least one scheduled refresh."""
+        return (
+            self.data_updated_at is None
+            or dt_util.utcnow() - self.data_updated_at
+            > 2 * self._scheduler.tick_interval
+        )
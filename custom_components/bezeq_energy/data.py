@@ -6,11 +6,20 @@ from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
+    from datetime import datetime
+
     from homeassistant.config_entries import ConfigEntry
     from homeassistant.loader import Integration
-    from my_bezeq import MyBezeqAPI
 
+    from .account import BezeqAccount
+    from .anomaly import AnomalyDetector
+    from .backfill import BezeqBackfill
     from .coordinator import BezeqElecDataUpdateCoordinator
+    from .fleet import BezeqFleet
+    from .ledger import InvoiceLedger
+    from .snapshot_store import SnapshotStore
+    from .statistics import BezeqStatisticsImporter
+    from .usage_cache import UsageCache
 
 
 type BezeqEnergyConfigEntry = ConfigEntry[BezeqEnergyData]
@@ -26,11 +35,44 @@ class BezeqEnergyDeviceInfo:
     subscriber_number: str
 
 
+@dataclass
+class BezeqEnergySectionStatus:
+    """Freshness of one section of the coordinator data."""
+
+    last_success: datetime | None = None
+    stale_since: datetime | None = None
+    error: str | None = None
+    # Bumped when the section's values or staleness change
+    version: int = 0
+
+    def mark_success(self, now: datetime, *, changed: bool) -> None:
+        """Record that the section was built from fresh data."""
+        if changed or self.stale_since is not None:
+            self.version += 1
+        self.last_success = now
+        self.stale_since = None
+        self.error = None
+
+    def mark_failed(self, now: datetime, exception: Exception) -> None:
+        """Record that the section kept its last good value."""
+        if self.stale_since is None:
+            self.stale_since = now
+            self.version += 1
+        self.error = str(exception)
+
+
 @dataclass
 class BezeqEnergyData:
     """Data for the BezeqEnergy integration."""
 
-    client: MyBezeqAPI
+    account: BezeqAccount
+    usage_cache: UsageCache
+    invoice_ledger: InvoiceLedger
+    snapshot_store: SnapshotStore
     coordinator: BezeqElecDataUpdateCoordinator
     integration: Integration
     device_info: BezeqEnergyDeviceInfo
+    fleet: BezeqFleet
+    statistics: BezeqStatisticsImporter | None = None
+    backfill: BezeqBackfill | None = None
+    anomaly_detector: AnomalyDetector | None = None
@@ -0,0 +1,51 @@
+"""Diagnostics support for bezeq_energy."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .data import BezeqEnergyConfigEntry
+
+TO_REDACT = {CONF_USERNAME, CONF_PASSWORD}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant,  # noqa: ARG001 function argument: `hass`
+    entry: BezeqEnergyConfigEntry,
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    runtime_data = entry.runtime_data
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "account": runtime_data.account.as_diagnostics(),
+        "schedule": runtime_data.coordinator.scheduler.as_diagnostics(),
+        "breaker": runtime_data.coordinator.breaker.as_diagnostics(),
+        "fleet": runtime_data.fleet.as_diagnostics(),
+        "skipped_writes": runtime_data.coordinator.skipped_writes,
+        "sections": {
+            section: asdict(status)
+            for section, status in runtime_data.coordinator.sections.items()
+        },
+        "usage_cache": runtime_data.usage_cache.as_diagnostics(),
+        "daily_series": runtime_data.coordinator.daily_series.as_diagnostics(),
+        "intervals": runtime_data.coordinator.intervals.as_diagnostics(),
+        "time_of_use": runtime_data.coordinator.time_of_use.as_diagnostics(),
+        "forecast": runtime_data.coordinator.forecaster.as_diagnostics(),
+        "anomaly": runtime_data.anomaly_detector.as_diagnostics()
+        if runtime_data.anomaly_detector
+        else None,
+        "invoice_ledger": runtime_data.invoice_ledger.as_diagnostics(),
+        "statistics": runtime_data.statistics.as_diagnostics()
+        if runtime_data.statistics
+        else None,
+        "backfill": runtime_data.backfill.as_diagnostics()
+        if runtime_data.backfill
+        else None,
+    }
@@ -3,26 +3,40 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
+from homeassistant.core import callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import ATTRIBUTION, DOMAIN
-from .coordinator import BezeqElecDataUpdateCoordinator
+from .const import (
+    ATTR_LAST_SUCCESS,
+    ATTR_STALE,
+    ATTR_STALE_SINCE,
+    ATTRIBUTION,
+    DOMAIN,
+)
+from .coordinator import BezeqElecDataUpdateCoordinator, get_section_id
 
 if TYPE_CHECKING:
     from collections.abc import Callable
 
     from custom_components.bezeq_energy.data import BezeqEnergyDeviceInfo
 
+    from .snapshot import BezeqEnergySnapshot
+
 
 @dataclass(frozen=True, kw_only=True)
 class BezeqEnergyEntityDescriptionMixin:
     """Mixin values for required keys."""
 
-    value_fn: Callable[dict, str | float] | None = None
-    custom_attrs_fn: Callable[dict, dict[str, str | int | float]] | None = None
+    value_fn: Callable[[BezeqEnergySnapshot], str | float | None] | None = None
+    custom_attrs_fn: (
+        Callable[[BezeqEnergySnapshot], dict[str, str | int | float] | None] | None
+    ) = None
+    section: str | None = None
+    # Unique across entries, for entities that didn't exist with bare key ids
+    entry_scoped: bool = False
 
 
 class BezeqEnergyEntity(CoordinatorEntity[BezeqElecDataUpdateCoordinator]):
@@ -35,17 +49,111 @@ class BezeqEnergyEntity(CoordinatorEntity[BezeqElecDataUpdateCoordinator]):
         self,
         coordinator: BezeqElecDataUpdateCoordinator,
         device_info: BezeqEnergyDeviceInfo,
+        subscriber: str | None = None,
     ) -> None:
         """Initialize."""
         super().__init__(coordinator)
+        # The entry's own subscriber keeps the entry's device, every other
+        # subscriber of the account gets a device of its own
+        self._subscriber = subscriber
+        entry_id = coordinator.config_entry.entry_id
         self._attr_device_info = DeviceInfo(
             identifiers={
                 (
                     DOMAIN,
-                    coordinator.config_entry.entry_id,
+                    f"{entry_id}_{subscriber}" if subscriber else entry_id,
                 ),
             },
             name=f"Bezeq Energy {device_info.contract_number}",
             manufacturer="Bezeq Energy",
             model=f"{device_info.subscriber_number} - {device_info.counter_number}",
         )
+        if subscriber:
+            self._attr_device_info["via_device"] = (DOMAIN, entry_id)
+        self._written_key: tuple[Any, ...] | None = None
+        self._custom_attributes: dict[str, Any] = {}
+        self._custom_attributes_version: int | None = None
+
+    def get_unique_id(self, key: str, *, entry_scoped: bool = False) -> str:
+        """Return the unique id of this subscriber's entity for a key."""
+        entry_id = self.coordinator.config_entry.entry_id
+        if self._subscriber:
+            return f"{entry_id}_{self._subscriber}_{key}"
+        # The entry's original entities keep the bare ids they were created with
+        return f"{entry_id}_{key}" if entry_scoped else key
+
+    @property
+    def entity_data(self) -> BezeqEnergySnapshot | None:
+        """Return the coordinator snapshot of this entity's subscriber."""
+        if self._subscriber is None or self.coordinator.data is None:
+            return self.coordinator.data
+        return self.coordinator.data.subscribers.get(self._subscriber)
+
+    @property
+    def section_version(self) -> int | None:
+        """Return the version of the section this entity reads, if any."""
+        section = getattr(self.entity_description, "section", None)
+        if section and (
+            status := self.coordinator.sections.get(
+                get_section_id(section, self._subscriber)
+            )
+        ):
+            return status.version
+        return None
+
+    def _get_write_key(self) -> tuple[Any, ...] | None:
+        """Return what a state write depends on, None if it can't be told."""
+        if (version := self.section_version) is None:
+            return None
+        # Staleness attributes change without the section changing
+        return (version, self.available, self.coordinator.is_stale)
+
+    async def async_added_to_hass(self) -> None:
+        """Remember what the first state write was based on."""
+        await super().async_added_to_hass()
+        self._written_key = self._get_write_key()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only if the section or its staleness changed."""
+        key = self._get_write_key()
+        if key is not None and key == self._written_key:
+            self.coordinator.skipped_writes += 1
+            return
+        self._written_key = key
+        super()._handle_coordinator_update()
+
+    def _get_custom_attributes(self) -> dict[str, Any]:
+        """Evaluate custom_attrs_fn once per version of the entity's section."""
+        custom_attrs_fn = getattr(self.entity_description, "custom_attrs_fn", None)
+        if custom_attrs_fn is None or (data := self.entity_data) is None:
+            return {}
+        version = self.section_version
+        if version is None or version != self._custom_attributes_version:
+            self._custom_attributes = custom_attrs_fn(data) or {}
+            self._custom_attributes_version = version
+        return self._custom_attributes
+
+    @property
+    def available(self) -> bool:
+        """Return False once the subscriber is gone from the account."""
+        return super().available and self.entity_data is not None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return entity specific state attributes, along with data staleness."""
+        attributes = dict(self._get_custom_attributes())
+        stale = self.coordinator.is_stale
+        section = getattr(self.entity_description, "section", None)
+        if section and (
+            status := self.coordinator.sections.get(
+                get_section_id(section, self._subscriber)
+            )
+        ):
+            if status.last_success:
+                attributes[ATTR_LAST_SUCCESS] = status.last_success.isoformat()
+            if status.stale_since:
+                attributes[ATTR_STALE_SINCE] = status.stale_since.isoformat()
+                stale = True
+        attributes[ATTR_STALE] = stale
+        return attributes
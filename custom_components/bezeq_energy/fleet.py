@@ -0,0 +1,131 @@
+"""Domain-wide scheduling of refreshes across all config entries."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import math
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
+
+from .const import (
+    DOMAIN,
+    FLEET_MAX_CONCURRENT_REFRESHES,
+    FLEET_REQUESTS_PER_MINUTE,
+    LOGGER,
+)
+from .throttle import AsyncRateLimiter
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+    from datetime import datetime, timedelta
+
+    from homeassistant.core import HomeAssistant
+
+DATA_FLEET = "fleet"
+
+# Fractional part of the golden ratio, spreads any number of phases evenly
+_PHASE_STEP = (math.sqrt(5) - 1) / 2
+
+
+@callback
+def async_get_fleet(hass: HomeAssistant) -> BezeqFleet:
+    """Return the fleet shared by every bezeq_energy config entry."""
+    domain_data: dict[str, Any] = hass.data.setdefault(DOMAIN, {})
+    if (fleet := domain_data.get(DATA_FLEET)) is None:
+        fleet = domain_data[DATA_FLEET] = BezeqFleet()
+    return fleet
+
+
+class BezeqFleet:
+    """
+    Share one request budget between all config entries.
+
+    Each account gets a phase within the refresh interval, so entries set up
+    together don't all poll at the top of the hour, while entries sharing an
+    account poll together and share its responses. Refreshes then run under a
+    global concurrency limit, with waiting entries served stalest data first,
+    and every API request draws from one requests-per-minute budget.
+    """
+
+    def __init__(
+        self,
+        max_concurrent_refreshes: int = FLEET_MAX_CONCURRENT_REFRESHES,
+        requests_per_minute: float = FLEET_REQUESTS_PER_MINUTE,
+    ) -> None:
+        """Initialize."""
+        self.limiter = AsyncRateLimiter(requests_per_minute)
+        self._max_concurrent_refreshes = max_concurrent_refreshes
+        self._active = 0
+        self._waiters: list[tuple[float, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+        self._phases: dict[str, float] = {}
+        self._next_phase = 0
+        self.refreshes = 0
+
+    @callback
+    def async_register(self, account_id: str, interval: timedelta) -> timedelta:
+        """Add an account to the fleet and return its phase within the interval."""
+        if account_id not in self._phases:
+            self._phases[account_id] = (self._next_phase * _PHASE_STEP) % 1
+            self._next_phase += 1
+        return interval * self._phases[account_id]
+
+    @callback
+    def async_unregister(self, account_id: str) -> None:
+        """Remove an account from the fleet."""
+        self._phases.pop(account_id, None)
+
+    @asynccontextmanager
+    async def async_refresh_slot(
+        self, data_updated_at: datetime | None
+    ) -> AsyncIterator[None]:
+        """Hold one of the refresh slots, entries with older data go first."""
+        priority = data_updated_at.timestamp() if data_updated_at else -math.inf
+        await self._async_acquire(priority)
+        try:
+            self.refreshes += 1
+            yield
+        finally:
+            self._release()
+
+    async def _async_acquire(self, priority: float) -> None:
+        if self._active < self._max_concurrent_refreshes and not self._waiters:
+            self._active += 1
+            return
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        item = (priority, next(self._sequence), waiter)
+        heapq.heappush(self._waiters, item)
+        LOGGER.debug("Waiting for a refresh slot, %s ahead", len(self._waiters) - 1)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as we were cancelled
+                self._release()
+            else:
+                self._waiters.remove(item)
+                heapq.heapify(self._waiters)
+            raise
+
+    def _release(self) -> None:
+        if self._waiters:
+            _, _, waiter = heapq.heappop(self._waiters)
+            # Hand the slot straight to the next entry
+            waiter.set_result(None)
+            return
+        self._active -= 1
+
+    def as_diagnostics(self) -> dict[str, Any]:
+        """Return the fleet state for diagnostics."""
+        return {
+            "accounts": len(self._phases),
+            "active_refreshes": self._active,
+            "waiting_refreshes": len(self._waiters),
+            "max_concurrent_refreshes": self._max_concurrent_refreshes,
+            "refreshes": self.refreshes,
+        }
@@ -0,0 +1,161 @@
+"""Month-end usage and cost forecast for bezeq_energy."""
+
+from __future__ import annotations
+
+import calendar
+import math
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any
+
+from my_bezeq import ElectricReportLevel
+
+from .const import FORECAST_ALPHA, FORECAST_Z
+from .usage_cache import is_closed_period
+
+if TYPE_CHECKING:
+    from datetime import date
+
+    from .aggregation import DailyUsageSeries
+    from .tariff import Tariff
+
+
+@dataclass(slots=True)
+class DayOfWeekProfile:
+    """Exponentially weighted mean and variance of daily kWh, per weekday."""
+
+    mean: list[float] = field(default_factory=lambda: [0.0] * 7)
+    variance: list[float] = field(default_factory=lambda: [0.0] * 7)
+    samples: list[int] = field(default_factory=lambda: [0] * 7)
+
+    def observe(self, day: date, kwh: float, alpha: float = FORECAST_ALPHA) -> None:
+        """Fold one settled day into its weekday, in constant time."""
+        weekday = day.weekday()
+        if not self.samples[weekday]:
+            self.mean[weekday] = kwh
+        else:
+            diff = kwh - self.mean[weekday]
+            increment = alpha * diff
+            self.mean[weekday] += increment
+            self.variance[weekday] = (1 - alpha) * (
+                self.variance[weekday] + diff * increment
+            )
+        self.samples[weekday] += 1
+
+    def expected(self, weekday: int) -> tuple[float, float] | None:
+        """Return the mean and variance of a weekday, or of all if it has none."""
+        if self.samples[weekday]:
+            return self.mean[weekday], self.variance[weekday]
+        observed = [day for day in range(7) if self.samples[day]]
+        if not observed:
+            return None
+        return (
+            math.fsum(self.mean[day] for day in observed) / len(observed),
+            max(self.variance[day] for day in observed),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class UsageForecast:
+    """Projected month-end usage and cost, with a confidence interval."""
+
+    kwh: float
+    kwh_low: float
+    kwh_high: float
+    cost: float
+    cost_low: float
+    cost_high: float
+    samples: int
+
+
+def count_weekdays(first: date, days: int) -> list[int]:
+    """Return how many times each weekday occurs in `days` days from `first`."""
+    weeks, remainder = divmod(days, 7)
+    counts = [weeks] * 7
+    for offset in range(remainder):
+        counts[(first.weekday() + offset) % 7] += 1
+    return counts
+
+
+class UsageForecaster:
+    """
+    Forecast the month-end usage of each subscriber from its daily series.
+
+    Each settled day is folded into a day-of-week profile exactly once, so a
+    refresh only folds the days that settled since the last one. The forecast
+    itself adds the profile of the days left in the month to the usage so far,
+    seven multiplications whatever the length of the history.
+    """
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._profiles: dict[str, DayOfWeekProfile] = {}
+        self._folded_through: dict[str, date] = {}
+
+    def update(self, series: DailyUsageSeries, today: date) -> int:
+        """Fold the days that settled since the last update, return how many."""
+        if series.first_day is None:
+            return 0
+        folded = 0
+        for subscriber in series.subscribers:
+            profile = self._profiles.setdefault(subscriber, DayOfWeekProfile())
+            day = self._folded_through.get(
+                subscriber, series.first_day - timedelta(days=1)
+            ) + timedelta(days=1)
+            while is_closed_period(ElectricReportLevel.DAILY, day, today):
+                if (
+                    record := series.get_record(subscriber, day)
+                ) and record.sum_all_day is not None:
+                    profile.observe(day, record.sum_all_day)
+                    folded += 1
+                self._folded_through[subscriber] = day
+                day += timedelta(days=1)
+        return folded
+
+    def forecast(
+        self,
+        subscriber: str,
+        today: date,
+        month_kwh: float,
+        today_kwh: float,
+        tariff: Tariff,
+    ) -> UsageForecast | None:
+        """Return the month-end forecast of a subscriber, if it has a profile."""
+        if (profile := self._profiles.get(subscriber)) is None or (
+            today_expected := profile.expected(today.weekday())
+        ) is None:
+            return None
+
+        # Today counts for whatever is still expected of it
+        mean, variance = today_expected
+        remaining = max(mean - today_kwh, 0.0)
+        remaining_variance = variance
+        days_left = calendar.monthrange(today.year, today.month)[1] - today.day
+        for weekday, count in enumerate(
+            count_weekdays(today + timedelta(days=1), days_left)
+        ):
+            if count and (expected := profile.expected(weekday)):
+                remaining += count * expected[0]
+                remaining_variance += count * expected[1]
+
+        kwh = month_kwh + remaining
+        margin = FORECAST_Z * math.sqrt(remaining_variance)
+        # The days left are priced at the tariff's mean over a whole week
+        price = tariff.mean_price
+        cost_so_far = month_kwh * price
+        return UsageForecast(
+            kwh=kwh,
+            kwh_low=max(kwh - margin, month_kwh),
+            kwh_high=kwh + margin,
+            cost=cost_so_far + remaining * price,
+            cost_low=cost_so_far + max(remaining - margin, 0.0) * price,
+            cost_high=cost_so_far + (remaining + margin) * price,
+            samples=sum(profile.samples),
+        )
+
+    def as_diagnostics(self) -> dict[str, Any]:
+        """Return the profile sizes for diagnostics."""
+        return {
+            "subscribers": len(self._profiles),
+            "samples": sum(sum(profile.samples) for profile in self._profiles.values()),
+        }
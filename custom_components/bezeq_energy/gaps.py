@@ -0,0 +1,95 @@
+"""Compact index of the usage periods imported into statistics."""
+
+from __future__ import annotations
+
+import base64
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+_FULL_BYTE = 0xFF
+
+
+class PeriodBitmap:
+    """
+    One bit per period (an hour or a day) from the first imported one onwards.
+
+    Five years of hours fit in under 6 KB, so the whole index lives in memory
+    and is saved along with the statistics watermark. A gap is a clear bit
+    below the newest set one.
+    """
+
+    __slots__ = ("_bits", "_length", "origin")
+
+    def __init__(
+        self, origin: int | None = None, length: int = 0, bits: bytes = b""
+    ) -> None:
+        """Initialize."""
+        self.origin = origin
+        # Periods from the origin to the newest set one, inclusive
+        self._length = length
+        self._bits = bytearray(bits)
+
+    def __len__(self) -> int:
+        """Return how many periods the index covers."""
+        return self._length
+
+    def __contains__(self, index: int) -> bool:
+        """Return True if the period is set."""
+        if self.origin is None or not 0 <= (offset := index - self.origin) < (
+            self._length
+        ):
+            return False
+        return bool(self._bits[offset >> 3] >> (offset & 7) & 1)
+
+    def add(self, index: int) -> bool:
+        """Set the bit of a period, return False if it is before the origin."""
+        if self.origin is None:
+            self.origin = index
+        if (offset := index - self.origin) < 0:
+            return False
+        if (missing := (offset >> 3) + 1 - len(self._bits)) > 0:
+            self._bits.extend(bytes(missing))
+        self._bits[offset >> 3] |= 1 << (offset & 7)
+        self._length = max(self._length, offset + 1)
+        return True
+
+    @property
+    def missing(self) -> int:
+        """Return how many periods below the newest set one are clear."""
+        return self._length - int.from_bytes(self._bits, "little").bit_count()
+
+    def iter_gaps(self) -> Iterator[tuple[int, int]]:
+        """Yield the runs of clear periods as (first, last) indexes, oldest first."""
+        if self.origin is None:
+            return
+        start: int | None = None
+        for byte_index, byte in enumerate(self._bits):
+            # Whole bytes inside or outside a gap are skipped without a bit loop
+            if (byte == _FULL_BYTE and start is None) or (
+                byte == 0 and start is not None
+            ):
+                continue
+            for offset in range(
+                byte_index << 3, min((byte_index + 1) << 3, self._length)
+            ):
+                if byte >> (offset & 7) & 1:
+                    if start is not None:
+                        yield self.origin + start, self.origin + offset - 1
+                        start = None
+                elif start is None:
+                    start = offset
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the index for storage."""
+        return {
+            "origin": self.origin,
+            "length": self._length,
+            "bits": base64.b64encode(self._bits).decode(),
+        }
+
+    @classmethod
+    def from_dict(cls, stored: dict[str, Any]) -> PeriodBitmap:
+        """Restore an index saved by `as_dict`."""
+        return cls(stored["origin"], stored["length"], base64.b64decode(stored["bits"]))
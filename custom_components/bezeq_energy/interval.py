@@ -0,0 +1,215 @@
+"""In-memory window of hourly smart meter usage."""
+
+from __future__ import annotations
+
+import math
+from array import array
+from datetime import UTC, date, datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+from my_bezeq import ElectricReportLevel
+
+from .const import INTERVAL_SLOT, INTERVAL_WINDOW
+from .statistics import get_record_start
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from .usage_cache import UsageRecord
+
+_SLOT_SECONDS = int(INTERVAL_SLOT.total_seconds())
+
+
+def get_slot(when: datetime) -> int:
+    """Return the absolute index of the slot `when` falls in."""
+    return int(when.timestamp()) // _SLOT_SECONDS
+
+
+def get_slot_start(slot: int) -> datetime:
+    """Return the (UTC) start time of an absolute slot."""
+    return datetime.fromtimestamp(slot * _SLOT_SECONDS, UTC)
+
+
+class IntervalBuffer:
+    """
+    Ring of the latest hourly kWh of one subscriber.
+
+    Values live in a preallocated `array('f')`, four bytes a slot, so the size is
+    fixed by the window no matter how many readings pass through. Slots with no
+    reading hold NaN.
+    """
+
+    __slots__ = ("_head", "_values")
+
+    def __init__(self, slots: int) -> None:
+        """Initialize."""
+        self._values = array("f", [math.nan]) * slots
+        # Absolute index of the newest slot, older slots wrap around behind it
+        self._head: int | None = None
+
+    @property
+    def slots(self) -> int:
+        """Return how many slots the buffer holds."""
+        return len(self._values)
+
+    @property
+    def head(self) -> int | None:
+        """Return the absolute index of the newest slot, if any."""
+        return self._head
+
+    @property
+    def nbytes(self) -> int:
+        """Return the memory taken by the values."""
+        return self._values.itemsize * len(self._values)
+
+    def put(self, slot: int, value: float) -> bool:
+        """Store the value of a slot, return False if it fell out of the window."""
+        slots = len(self._values)
+        if self._head is None:
+            self._head = slot
+        elif slot > self._head:
+            # Clear the slots skipped over, they held readings a window ago
+            for skipped in range(self._head + 1, min(slot, self._head + slots + 1)):
+                self._values[skipped % slots] = math.nan
+            self._head = slot
+        elif slot <= self._head - slots:
+            return False
+        self._values[slot % slots] = value
+        return True
+
+    def get(self, slot: int) -> float:
+        """Return the value of a slot, NaN if unknown."""
+        if self._head is None or not self._head - len(self._values) < slot <= (
+            self._head
+        ):
+            return math.nan
+        return self._values[slot % len(self._values)]
+
+    def window(self, start: int, end: int) -> array[float]:
+        """Return the values of slots `start` (inclusive) to `end` (exclusive)."""
+        values = array("f", [math.nan]) * max(end - start, 0)
+        if self._head is None or not values:
+            return values
+
+        slots = len(self._values)
+        # Copy the known part with at most two slices, the ring wraps only once
+        first = max(start, self._head - slots + 1)
+        last = min(end, self._head + 1)
+        slot = first
+        while slot < last:
+            offset = slot % slots
+            count = min(last - slot, slots - offset)
+            values[slot - start : slot - start + count] = self._values[
+                offset : offset + count
+            ]
+            slot += count
+        return values
+
+
+class IntervalStore:
+    """
+    Hourly usage of every subscriber of an entry, over a fixed window.
+
+    Filled by the coordinator (and the backfill) from hourly usage reports, and
+    queried by sensors and services. Memory is one `IntervalBuffer` a subscriber,
+    plus the set of days already loaded.
+    """
+
+    def __init__(self, window: timedelta = INTERVAL_WINDOW) -> None:
+        """Initialize."""
+        self.window = window
+        self._slots = int(window / INTERVAL_SLOT)
+        self._buffers: dict[str, IntervalBuffer] = {}
+        self._loaded_days: set[date] = set()
+        self._listeners: list[Callable[[str, int, float, float], None]] = []
+
+    def add_listener(self, listener: Callable[[str, int, float, float], None]) -> None:
+        """Call `listener(subscriber, slot, old, new)` whenever a reading changes."""
+        self._listeners.append(listener)
+
+    def add_usage(self, usage: dict[date, list[UsageRecord]], today: date) -> int:
+        """Store hourly usage records by day, return how many were in the window."""
+        first_day = today - self.window + timedelta(days=1)
+        self._loaded_days = {day for day in self._loaded_days if day >= first_day}
+
+        stored = 0
+        for day, records in usage.items():
+            if day >= first_day:
+                self._loaded_days.add(day)
+            for record in records:
+                if record.sum_all_hour is None:
+                    continue
+                if (buffer := self._buffers.get(record.subscriber)) is None:
+                    buffer = self._buffers[record.subscriber] = IntervalBuffer(
+                        self._slots
+                    )
+                slot = get_slot(
+                    get_record_start(ElectricReportLevel.HOURLY, day, record)
+                )
+                old = buffer.get(slot)
+                if not buffer.put(slot, record.sum_all_hour):
+                    continue
+                stored += 1
+                # Compare as stored, a float32 of the same reading is no change
+                if (new := buffer.get(slot)) != old:
+                    for listener in self._listeners:
+                        listener(record.subscriber, slot, old, new)
+        return stored
+
+    def missing_days(self, today: date) -> list[date]:
+        """Return the days of the window not loaded yet, newest first."""
+        return [
+            day
+            for offset in range(self.window.days)
+            if (day := today - timedelta(days=offset)) not in self._loaded_days
+        ]
+
+    def find_subscriber(self, include: Callable[[str], bool]) -> str | None:
+        """Return the first included subscriber that has a buffer."""
+        return next(
+            (subscriber for subscriber in self._buffers if include(subscriber)), None
+        )
+
+    def find(self, include: Callable[[str], bool]) -> IntervalBuffer | None:
+        """Return the buffer of the first included subscriber."""
+        if (subscriber := self.find_subscriber(include)) is None:
+            return None
+        return self._buffers[subscriber]
+
+    def series(
+        self, include: Callable[[str], bool], start: datetime, end: datetime
+    ) -> array[float]:
+        """Return the hourly kWh from `start` to `end`, NaN where unknown."""
+        if (buffer := self.find(include)) is None:
+            return array("f", [math.nan]) * max(get_slot(end) - get_slot(start), 0)
+        return buffer.window(get_slot(start), get_slot(end))
+
+    def query(
+        self, include: Callable[[str], bool], start: datetime, end: datetime
+    ) -> list[tuple[datetime, float]]:
+        """Return the known hourly readings from `start` to `end`."""
+        first = get_slot(start)
+        return [
+            (get_slot_start(first + index), value)
+            for index, value in enumerate(self.series(include, start, end))
+            if not math.isnan(value)
+        ]
+
+    @property
+    def nbytes(self) -> int:
+        """Return the memory taken by the values of every buffer."""
+        return sum(buffer.nbytes for buffer in self._buffers.values())
+
+    def as_diagnostics(self) -> dict[str, Any]:
+        """Return the buffer sizes for diagnostics."""
+        newest = max(
+            (buffer.head for buffer in self._buffers.values() if buffer.head),
+            default=None,
+        )
+        return {
+            "subscribers": len(self._buffers),
+            "slots": self._slots,
+            "nbytes": self.nbytes,
+            "loaded_days": len(self._loaded_days),
+            "newest": get_slot_start(newest).isoformat() if newest else None,
+        }
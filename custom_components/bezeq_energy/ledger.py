@@ -0,0 +1,147 @@
+"""Persisted ledger of electricity invoices."""
+
+from __future__ import annotations
+
+import dataclasses
+from collections import defaultdict
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any
+
+from dateutil.relativedelta import relativedelta
+from homeassistant.helpers.storage import Store
+from my_bezeq import Invoice
+
+from .commons import (
+    get_invoice_order,
+    translate_date_period,
+    translate_date_to_date_period,
+)
+from .const import (
+    DOMAIN,
+    INVOICE_LEDGER_SAVE_DELAY,
+    INVOICE_LEDGER_STORAGE_VERSION,
+    LOGGER,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+    from datetime import date
+
+    from homeassistant.core import HomeAssistant
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class InvoiceLedgerView:
+    """Read-only view of the ledger as of one month."""
+
+    month: date
+    by_month: Mapping[str, Invoice]
+    year_totals: Mapping[int, float]
+
+    def get_period(self, months_ago: int) -> str:
+        """Return the "YYYY-MM" period `months_ago` months before this one."""
+        return translate_date_to_date_period(
+            self.month - relativedelta(months=months_ago)
+        )
+
+    def get_month(self, months_ago: int) -> Invoice | None:
+        """Return the invoice of the month `months_ago` before this one."""
+        return self.by_month.get(self.get_period(months_ago))
+
+    @property
+    def year_to_date(self) -> float:
+        """Return the total of this year's invoices."""
+        return self.year_totals.get(self.month.year, 0.0)
+
+
+class InvoiceLedger:
+    """
+    Every invoice seen so far, indexed by period ("YYYY-MM") and by number.
+
+    The invoice tab is merged in on every refresh, but only invoices that are
+    new or changed (e.g. paid since) touch the indexes, and each invoice's
+    Hebrew date period is parsed once, when it is first seen. Yearly totals are
+    kept up to date as invoices are merged.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, INVOICE_LEDGER_STORAGE_VERSION, f"{DOMAIN}.invoices_{entry_id}"
+        )
+        self._by_number: dict[str, tuple[str, Invoice]] = {}
+        self._by_month: dict[str, Invoice] = {}
+        self._year_totals: dict[int, float] = defaultdict(float)
+        self._view: InvoiceLedgerView | None = None
+
+    async def async_load(self) -> None:
+        """Load the ledger from storage."""
+        if not (stored := await self._store.async_load()):
+            return
+        for item in stored["invoices"]:
+            self._index(item["period"], Invoice(**item["invoice"]))
+
+    def merge(self, invoices: Iterable[Invoice]) -> int:
+        """Add new and changed invoices, return how many were merged."""
+        merged = 0
+        for invoice in invoices:
+            if known := self._by_number.get(invoice.invoice_number):
+                period, known_invoice = known
+                if known_invoice == invoice:
+                    continue
+            else:
+                try:
+                    period = translate_date_period(invoice.date_period)
+                except (IndexError, ValueError) as exception:
+                    LOGGER.warning(
+                        "Skipping invoice %s: %s", invoice.invoice_number, exception
+                    )
+                    continue
+            self._index(period, invoice)
+            merged += 1
+
+        if merged:
+            self._view = None
+            self._store.async_delay_save(self._data_to_save, INVOICE_LEDGER_SAVE_DELAY)
+        return merged
+
+    def get_month(self, period: str) -> Invoice | None:
+        """Return the invoice of a "YYYY-MM" period."""
+        return self._by_month.get(period)
+
+    def view(self, month: date) -> InvoiceLedgerView:
+        """Return a read-only view as of `month`, shared until the ledger changes."""
+        month = month.replace(day=1)
+        if self._view is None or self._view.month != month:
+            self._view = InvoiceLedgerView(
+                month=month,
+                by_month=MappingProxyType(dict(self._by_month)),
+                year_totals=MappingProxyType(dict(self._year_totals)),
+            )
+        return self._view
+
+    def _index(self, period: str, invoice: Invoice) -> None:
+        if known := self._by_number.get(invoice.invoice_number):
+            self._year_totals[int(known[0][:4])] -= known[1].sum or 0.0
+        self._by_number[invoice.invoice_number] = (period, invoice)
+        self._year_totals[int(period[:4])] += invoice.sum or 0.0
+
+        # A period may be invoiced more than once, the latest invoice wins
+        current = self._by_month.get(period)
+        if current is None or get_invoice_order(current) <= get_invoice_order(invoice):
+            self._by_month[period] = invoice
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return {
+            "invoices": [
+                {"period": period, "invoice": dataclasses.asdict(invoice)}
+                for period, invoice in self._by_number.values()
+            ]
+        }
+
+    def as_diagnostics(self) -> dict[str, Any]:
+        """Return ledger statistics for diagnostics."""
+        return {
+            "invoices": len(self._by_number),
+            "months": len(self._by_month),
+        }
@@ -0,0 +1,106 @@
+"""Per-dataset refresh scheduling for bezeq_energy."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any
+
+from .const import (
+    DATASET_DAILY_USAGE,
+    DATASET_ELECTRICITY_TAB,
+    DATASET_HOURLY_USAGE,
+    DATASET_INVOICES,
+    DATASET_MONTHLY_USAGE,
+)
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+
+@dataclass(frozen=True, kw_only=True)
+class RefreshWindow:
+    """Cron-like window in which a dataset is allowed to refresh."""
+
+    hours: frozenset[int] = field(default_factory=lambda: frozenset(range(24)))
+    weekdays: frozenset[int] = field(default_factory=lambda: frozenset(range(7)))
+    days: frozenset[int] = field(default_factory=lambda: frozenset(range(1, 32)))
+
+    def matches(self, when: datetime) -> bool:
+        """Return True if `when` falls inside the window."""
+        return (
+            when.hour in self.hours
+            and when.weekday() in self.weekdays
+            and when.day in self.days
+        )
+
+
+@dataclass(frozen=True, kw_only=True)
+class RefreshPolicy:
+    """How often a dataset should be refreshed."""
+
+    ttl: timedelta
+    windows: tuple[RefreshWindow, ...] = ()
+
+    def allows(self, when: datetime) -> bool:
+        """Return True if a refresh may run at `when`."""
+        return not self.windows or any(window.matches(when) for window in self.windows)
+
+
+DEFAULT_REFRESH_POLICIES: dict[str, RefreshPolicy] = {
+    DATASET_DAILY_USAGE: RefreshPolicy(ttl=timedelta(hours=1)),
+    DATASET_HOURLY_USAGE: RefreshPolicy(ttl=timedelta(hours=1)),
+    # Monthly totals are summed from the daily series, the report only reconciles
+    DATASET_MONTHLY_USAGE: RefreshPolicy(ttl=timedelta(hours=24)),
+    DATASET_ELECTRICITY_TAB: RefreshPolicy(ttl=timedelta(hours=12)),
+    # Invoices are issued about once a month, there's no point polling at night
+    DATASET_INVOICES: RefreshPolicy(
+        ttl=timedelta(hours=24),
+        windows=(RefreshWindow(hours=frozenset(range(6, 23))),),
+    ),
+}
+
+
+class RefreshScheduler:
+    """Track when each dataset is next due for a refresh."""
+
+    def __init__(self, policies: dict[str, RefreshPolicy] | None = None) -> None:
+        """Initialize."""
+        self._policies = policies or DEFAULT_REFRESH_POLICIES
+        self._next_due: dict[str, datetime] = {}
+
+    @property
+    def tick_interval(self) -> timedelta:
+        """Return how often the scheduler needs to be polled."""
+        return min(policy.ttl for policy in self._policies.values())
+
+    def due(self, now: datetime) -> set[str]:
+        """Return the datasets that should be refreshed at `now`."""
+        # Ticks land a little early or late, a dataset due within half a tick
+        # is refreshed on this one rather than a whole tick later
+        now_with_tolerance = now + self.tick_interval / 2
+        due = set()
+        for dataset, policy in self._policies.items():
+            next_due = self._next_due.get(dataset)
+            # A dataset that was never fetched is always due, regardless of windows
+            if next_due is None or (
+                now_with_tolerance >= next_due and policy.allows(now)
+            ):
+                due.add(dataset)
+        return due
+
+    def mark_fetched(self, dataset: str, now: datetime) -> None:
+        """Record a successful refresh of `dataset`."""
+        self._next_due[dataset] = now + self._policies[dataset].ttl
+
+    def as_diagnostics(self) -> dict[str, Any]:
+        """Return the schedule for diagnostics."""
+        return {
+            dataset: {
+                "ttl": policy.ttl.total_seconds(),
+                "next_due": next_due.isoformat()
+                if (next_due := self._next_due.get(dataset))
+                else None,
+            }
+            for dataset, policy in self._policies.items()
+        }
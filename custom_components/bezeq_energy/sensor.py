@@ -3,29 +3,33 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
     SensorEntityDescription,
 )
-from homeassistant.const import UnitOfEnergy
+from homeassistant.const import EntityCategory, UnitOfEnergy
+from homeassistant.core import callback
 
-from .commons import (
-    translate_date_period,
-)
+from .breaker import CircuitState
 from .const import (
-    DAILY_USAGE_KEY,
-    LAST_MONTH_INVOICE_KEY,
-    LAST_MONTH_USAGE_KEY,
-    MONTHLY_USAGE_KEY,
-    MY_PACKAGE_KEY,
+    FORECAST_CONFIDENCE,
+    SECTION_COST,
+    SECTION_FORECAST,
+    SECTION_INVOICES,
+    SECTION_PACKAGE,
+    SECTION_USAGE,
+    THIS_MONTH_COST_KEY,
+    TODAY_COST_KEY,
     UNIT_ILS,
 )
 from .entity import BezeqEnergyEntity, BezeqEnergyEntityDescriptionMixin
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
     from homeassistant.core import HomeAssistant
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
@@ -42,34 +46,160 @@ class BezeqEnergySensorEntityDescription(
     """Class describing Bezeq Energy sensors entities."""
 
 
+@dataclass(frozen=True, kw_only=True)
+class BezeqEnergyDiagnosticSensorEntityDescription(SensorEntityDescription):
+    """Class describing Bezeq Energy sensors that report on the integration itself."""
+
+    value_fn: Callable[[BezeqElecDataUpdateCoordinator], Any]
+
+
+def invoice_month_cost_description(
+    key: str, months_ago: int, *, entry_scoped: bool = False
+) -> BezeqEnergySensorEntityDescription:
+    """Describe a sensor for the invoice of the month `months_ago` months back."""
+    return BezeqEnergySensorEntityDescription(
+        key=key,
+        entry_scoped=entry_scoped,
+        section=SECTION_INVOICES,
+        device_class=SensorDeviceClass.MONETARY,
+        native_unit_of_measurement=UNIT_ILS,
+        suggested_display_precision=3,
+        value_fn=lambda data: (
+            invoice.sum
+            if data.invoices and (invoice := data.invoices.get_month(months_ago))
+            else None
+        ),
+        custom_attrs_fn=lambda data: (
+            {
+                "month": data.invoices.get_period(months_ago),
+                "invoice_id": invoice.invoice_id,
+                "is_paid": invoice.is_payed,
+            }
+            if data.invoices and (invoice := data.invoices.get_month(months_ago))
+            else None
+        ),
+    )
+
+
+def usage_cost_description(key: str) -> BezeqEnergySensorEntityDescription:
+    """Describe a sensor for the cost of the usage over a period."""
+    return BezeqEnergySensorEntityDescription(
+        key=key,
+        entry_scoped=True,
+        section=SECTION_COST,
+        device_class=SensorDeviceClass.MONETARY,
+        native_unit_of_measurement=UNIT_ILS,
+        suggested_display_precision=2,
+        value_fn=lambda data: summary.cost if (summary := getattr(data, key)) else None,
+        custom_attrs_fn=lambda data: (
+            {
+                "kwh": summary.kwh,
+                "hours": summary.hours,
+                "price": summary.price,
+                "discount": summary.discount,
+            }
+            if (summary := getattr(data, key))
+            else None
+        ),
+    )
+
+
+def time_of_use_description(
+    key: str, field: str, *, monetary: bool = False
+) -> BezeqEnergySensorEntityDescription:
+    """Describe a sensor for one figure of this month's time-of-use buckets."""
+    return BezeqEnergySensorEntityDescription(
+        key=key,
+        entry_scoped=True,
+        section=SECTION_COST,
+        device_class=SensorDeviceClass.MONETARY
+        if monetary
+        else SensorDeviceClass.ENERGY,
+        native_unit_of_measurement=UNIT_ILS
+        if monetary
+        else UnitOfEnergy.KILO_WATT_HOUR,
+        suggested_display_precision=2 if monetary else 3,
+        value_fn=lambda data: (
+            getattr(data.time_of_use, field) if data.time_of_use else None
+        ),
+        custom_attrs_fn=lambda data: (
+            {"window": data.time_of_use.window} if data.time_of_use else None
+        ),
+    )
+
+
+def forecast_description(
+    key: str, *, monetary: bool = False
+) -> BezeqEnergySensorEntityDescription:
+    """Describe a sensor for the month-end usage or cost forecast."""
+    return BezeqEnergySensorEntityDescription(
+        key=key,
+        entry_scoped=True,
+        section=SECTION_FORECAST,
+        device_class=SensorDeviceClass.MONETARY
+        if monetary
+        else SensorDeviceClass.ENERGY,
+        native_unit_of_measurement=UNIT_ILS
+        if monetary
+        else UnitOfEnergy.KILO_WATT_HOUR,
+        suggested_display_precision=2 if monetary else 1,
+        value_fn=lambda data: (
+            (data.forecast.cost if monetary else data.forecast.kwh)
+            if data.forecast
+            else None
+        ),
+        custom_attrs_fn=lambda data: (
+            {
+                "low": data.forecast.cost_low if monetary else data.forecast.kwh_low,
+                "high": data.forecast.cost_high if monetary else data.forecast.kwh_high,
+                "confidence": FORECAST_CONFIDENCE,
+                "samples": data.forecast.samples,
+            }
+            if data.forecast
+            else None
+        ),
+    )
+
+
 ENTITY_DESCRIPTIONS = [
     BezeqEnergySensorEntityDescription(
         key="last_month_cost",
+        section=SECTION_INVOICES,
         device_class=SensorDeviceClass.MONETARY,
         native_unit_of_measurement=UNIT_ILS,
         suggested_display_precision=3,
         value_fn=lambda data: (
-            data[LAST_MONTH_INVOICE_KEY].sum if data[LAST_MONTH_INVOICE_KEY] else None
+            data.last_month_invoice.sum if data.last_month_invoice else None
         ),
         custom_attrs_fn=lambda data: {
-            "month": translate_date_period(data[LAST_MONTH_INVOICE_KEY].date_period)
-            if data[LAST_MONTH_INVOICE_KEY]
-            else None,
-            "invoice_id": data[LAST_MONTH_INVOICE_KEY].invoice_id
-            if data[LAST_MONTH_INVOICE_KEY]
+            "month": data.last_month_invoice_period,
+            "invoice_id": data.last_month_invoice.invoice_id
+            if data.last_month_invoice
             else None,
         },
     ),
+    invoice_month_cost_description(
+        "two_months_ago_cost", months_ago=2, entry_scoped=True
+    ),
+    BezeqEnergySensorEntityDescription(
+        key="year_to_date_cost",
+        entry_scoped=True,
+        section=SECTION_INVOICES,
+        device_class=SensorDeviceClass.MONETARY,
+        native_unit_of_measurement=UNIT_ILS,
+        suggested_display_precision=3,
+        value_fn=lambda data: data.invoices.year_to_date if data.invoices else None,
+        custom_attrs_fn=lambda data: {
+            "year": data.invoices.month.year if data.invoices else None
+        },
+    ),
     BezeqEnergySensorEntityDescription(
         key="package",
-        value_fn=lambda data: (
-            data[MY_PACKAGE_KEY].package_name if data[MY_PACKAGE_KEY] else None
-        ),
+        section=SECTION_PACKAGE,
+        value_fn=lambda data: data.my_package.package_name if data.my_package else None,
         custom_attrs_fn=lambda data: {
-            "description": data[MY_PACKAGE_KEY].description
-            if data[MY_PACKAGE_KEY]
-            else None,
-            "discount": data[MY_PACKAGE_KEY].discount if data[MY_PACKAGE_KEY] else None,
+            "description": data.my_package.description if data.my_package else None,
+            "discount": data.my_package.discount if data.my_package else None,
         },
     ),
 ]
@@ -77,48 +207,78 @@ ENTITY_DESCRIPTIONS = [
 SMART_METER_ENTITY_DESCRIPTIONS = [
     BezeqEnergySensorEntityDescription(
         key="this_month_usage",
+        section=SECTION_USAGE,
         device_class=SensorDeviceClass.ENERGY,
         native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
         suggested_display_precision=3,
         value_fn=lambda data: (
-            data[MONTHLY_USAGE_KEY].sum_all_month if data[MONTHLY_USAGE_KEY] else None
+            data.monthly_usage.sum_all_month if data.monthly_usage else None
         ),
         custom_attrs_fn=lambda data: {
-            "current_month": data[MONTHLY_USAGE_KEY].usage_month
-            if data[MONTHLY_USAGE_KEY]
+            "current_month": data.monthly_usage.usage_month
+            if data.monthly_usage
             else None
         },
     ),
     BezeqEnergySensorEntityDescription(
         key="today_usage",
+        section=SECTION_USAGE,
         device_class=SensorDeviceClass.ENERGY,
         native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
         suggested_display_precision=3,
         value_fn=lambda data: (
-            data[DAILY_USAGE_KEY].sum_all_day if data[DAILY_USAGE_KEY] else None
+            data.daily_usage.sum_all_day if data.daily_usage else None
         ),
         custom_attrs_fn=lambda data: {
-            "current_day": data[DAILY_USAGE_KEY].usage_day
-            if data[DAILY_USAGE_KEY]
-            else None
+            "current_day": data.daily_usage.usage_day if data.daily_usage else None
         },
     ),
     BezeqEnergySensorEntityDescription(
         key="last_month_usage",
+        section=SECTION_USAGE,
         device_class=SensorDeviceClass.ENERGY,
         native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
         suggested_display_precision=3,
         value_fn=lambda data: (
-            data[LAST_MONTH_USAGE_KEY].sum_all_month
-            if data[LAST_MONTH_USAGE_KEY]
-            else None
+            data.last_month_usage.sum_all_month if data.last_month_usage else None
         ),
         custom_attrs_fn=lambda data: {
-            "month": data[LAST_MONTH_USAGE_KEY].usage_month
-            if data[LAST_MONTH_USAGE_KEY]
+            "month": data.last_month_usage.usage_month
+            if data.last_month_usage
             else None
         },
     ),
+    usage_cost_description(TODAY_COST_KEY),
+    usage_cost_description(THIS_MONTH_COST_KEY),
+    time_of_use_description("discounted_hours_usage", "discounted"),
+    time_of_use_description("regular_hours_usage", "regular"),
+    time_of_use_description("weekend_usage", "weekend"),
+    time_of_use_description("package_savings", "savings", monetary=True),
+    forecast_description("month_end_usage_forecast"),
+    forecast_description("month_end_cost_forecast", monetary=True),
+]
+
+
+DIAGNOSTIC_ENTITY_DESCRIPTIONS = [
+    BezeqEnergyDiagnosticSensorEntityDescription(
+        key="api_circuit_state",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        device_class=SensorDeviceClass.ENUM,
+        options=list(CircuitState),
+        value_fn=lambda coordinator: coordinator.breaker.state,
+    ),
+    BezeqEnergyDiagnosticSensorEntityDescription(
+        key="api_next_retry",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=lambda coordinator: coordinator.breaker.next_retry,
+    ),
+    BezeqEnergyDiagnosticSensorEntityDescription(
+        key="data_updated_at",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=lambda coordinator: coordinator.data_updated_at,
+    ),
 ]
 
 
@@ -128,7 +288,8 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the sensor platform."""
-    entity_descriptions = ENTITY_DESCRIPTIONS
+    coordinator = entry.runtime_data.coordinator
+    entity_descriptions = list(ENTITY_DESCRIPTIONS)
     if entry.runtime_data.device_info.is_smart_meter:
         entity_descriptions += SMART_METER_ENTITY_DESCRIPTIONS
 
@@ -140,6 +301,43 @@ async def async_setup_entry(
         )
         for entity_description in entity_descriptions
     )
+    async_add_entities(
+        BezeqEnergyDiagnosticSensor(
+            coordinator=entry.runtime_data.coordinator,
+            entity_description=entity_description,
+            device_info=entry.runtime_data.device_info,
+        )
+        for entity_description in DIAGNOSTIC_ENTITY_DESCRIPTIONS
+    )
+
+    added: set[str] = set()
+
+    @callback
+    def _async_add_subscribers() -> None:
+        """Add sensors for subscribers that joined the account."""
+        for subscriber, device_info in coordinator.subscribers.items():
+            if subscriber in added:
+                continue
+            added.add(subscriber)
+            descriptions = [
+                description
+                for description in ENTITY_DESCRIPTIONS
+                if description.section != SECTION_INVOICES
+            ]
+            if device_info.is_smart_meter:
+                descriptions += SMART_METER_ENTITY_DESCRIPTIONS
+            async_add_entities(
+                BezeqEnergySensor(
+                    coordinator=coordinator,
+                    entity_description=entity_description,
+                    device_info=device_info,
+                    subscriber=subscriber,
+                )
+                for entity_description in descriptions
+            )
+
+    _async_add_subscribers()
+    entry.async_on_unload(coordinator.async_add_listener(_async_add_subscribers))
 
 
 class BezeqEnergySensor(BezeqEnergyEntity, SensorEntity):
@@ -150,24 +348,49 @@ class BezeqEnergySensor(BezeqEnergyEntity, SensorEntity):
         coordinator: BezeqElecDataUpdateCoordinator,
         entity_description: BezeqEnergySensorEntityDescription,
         device_info: BezeqEnergyDeviceInfo,
+        subscriber: str | None = None,
     ) -> None:
         """Initialize the sensor class."""
-        super().__init__(coordinator, device_info)
+        super().__init__(coordinator, device_info, subscriber)
         self.entity_description = entity_description
-        self._attr_unique_id = entity_description.key
+        self._attr_unique_id = self.get_unique_id(
+            entity_description.key, entry_scoped=entity_description.entry_scoped
+        )
         self._attr_translation_key = entity_description.key
 
-        attributes = {}
-        if self.entity_description.custom_attrs_fn:
-            custom_attr = self.entity_description.custom_attrs_fn(self.coordinator.data)
-            if custom_attr:
-                attributes.update(custom_attr)
-
-        self._attr_extra_state_attributes = attributes
-
     @property
     def native_value(self) -> str | None:
         """Return the native value of the sensor."""
-        if self.coordinator.data:
-            return self.entity_description.value_fn(self.coordinator.data)
+        if self.entity_data:
+            return self.entity_description.value_fn(self.entity_data)
         return None
+
+
+class BezeqEnergyDiagnosticSensor(BezeqEnergyEntity, SensorEntity):
+    """bezeq_energy sensor reporting the state of the coordinator."""
+
+    entity_description: BezeqEnergyDiagnosticSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: BezeqElecDataUpdateCoordinator,
+        entity_description: BezeqEnergyDiagnosticSensorEntityDescription,
+        device_info: BezeqEnergyDeviceInfo,
+    ) -> None:
+        """Initialize the sensor class."""
+        super().__init__(coordinator, device_info)
+        self.entity_description = entity_description
+        self._attr_unique_id = self.get_unique_id(
+            entity_description.key, entry_scoped=True
+        )
+        self._attr_translation_key = entity_description.key
+
+    @property
+    def available(self) -> bool:
+        """Stay available while refreshes fail, that's when these matter most."""
+        return True
+
+    @property
+    def native_value(self) -> Any:
+        """Return the native value of the sensor."""
+        return self.entity_description.value_fn(self.coordinator)
@@ -0,0 +1,148 @@
+"""Services for bezeq_energy."""
+
+from __future__ import annotations
+
+from contextlib import aclosing
+from datetime import date, datetime, time
+from typing import TYPE_CHECKING, Any
+
+import homeassistant.helpers.config_validation as cv
+import homeassistant.util.dt as dt_util
+import voluptuous as vol
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import SupportsResponse, callback
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from my_bezeq import ElectricReportLevel, MyBezeqError
+
+from .commons import timezone
+from .const import (
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_END_DATE,
+    ATTR_LEVEL,
+    ATTR_START_DATE,
+    DOMAIN,
+    SERVICE_GET_USAGE,
+    USAGE_LEVEL_DAILY,
+    USAGE_LEVEL_HOURLY,
+    USAGE_LEVEL_MONTHLY,
+    USAGE_SERVICE_MAX_RECORDS,
+)
+from .statistics import get_record_start, get_record_value
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse
+
+    from .data import BezeqEnergyConfigEntry
+    from .usage_cache import UsageRecord
+
+USAGE_LEVELS = {
+    USAGE_LEVEL_HOURLY: ElectricReportLevel.HOURLY,
+    USAGE_LEVEL_DAILY: ElectricReportLevel.DAILY,
+    USAGE_LEVEL_MONTHLY: ElectricReportLevel.MONTHLY,
+}
+
+GET_USAGE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_LEVEL): vol.In(USAGE_LEVELS),
+        vol.Required(ATTR_START_DATE): cv.date,
+        vol.Optional(ATTR_END_DATE): cv.date,
+    }
+)
+
+
+def _get_entry(hass: HomeAssistant, entry_id: str) -> BezeqEnergyConfigEntry:
+    """Return a loaded bezeq_energy entry, or raise a validation error."""
+    entry = hass.config_entries.async_get_entry(entry_id)
+    if entry is None or entry.domain != DOMAIN:
+        msg = f"Unknown Bezeq Energy entry {entry_id}"
+        raise ServiceValidationError(msg)
+    if entry.state != ConfigEntryState.LOADED:
+        msg = f"Bezeq Energy entry {entry.title} is not loaded"
+        raise ServiceValidationError(msg)
+    return entry
+
+
+def _encode_record(
+    level: ElectricReportLevel, period: date, record: UsageRecord
+) -> dict[str, Any]:
+    if level == ElectricReportLevel.MONTHLY:
+        start = datetime.combine(period, time(), tzinfo=timezone)
+        kwh = record.sum_all_month
+    else:
+        start = get_record_start(level, period, record)
+        kwh = get_record_value(level, record)
+    return {"subscriber": record.subscriber, "start": start.isoformat(), "kwh": kwh}
+
+
+async def _async_get_usage(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """
+    Return the usage of a date range, at most a capped number of records.
+
+    Pages come from the entry's usage cache, so settled periods never hit the
+    API again, and are encoded as they arrive. Once the cap is reached the
+    remaining pages aren't fetched at all, `next_start` is where a follow-up
+    call picks up.
+    """
+    entry = _get_entry(hass, call.data[ATTR_CONFIG_ENTRY_ID])
+    runtime_data = entry.runtime_data
+    if not runtime_data.device_info.is_smart_meter:
+        msg = f"Bezeq Energy entry {entry.title} has no smart meter usage"
+        raise ServiceValidationError(msg)
+
+    level = USAGE_LEVELS[call.data[ATTR_LEVEL]]
+    today = dt_util.now(timezone).date()
+    start: date = call.data[ATTR_START_DATE]
+    end: date = min(call.data.get(ATTR_END_DATE, today), today)
+    if start > end:
+        msg = f"Start date {start} is after the end date {end}"
+        raise ServiceValidationError(msg)
+
+    account = runtime_data.account
+    records: list[dict[str, Any]] = []
+    next_start: date | None = None
+    try:
+        await account.session.async_ensure_session()
+        async with aclosing(
+            runtime_data.usage_cache.async_iter_usage(
+                account.client, level, start, end, runtime_data.fleet.limiter
+            )
+        ) as pages:
+            async for period, period_records in pages:
+                if records and len(records) + len(period_records) > (
+                    USAGE_SERVICE_MAX_RECORDS
+                ):
+                    next_start = period
+                    break
+                records.extend(
+                    _encode_record(level, period, record) for record in period_records
+                )
+    except MyBezeqError as exception:
+        msg = f"Failed to fetch usage from my.bezeq: {exception}"
+        raise HomeAssistantError(msg) from exception
+
+    return {
+        ATTR_LEVEL: call.data[ATTR_LEVEL],
+        ATTR_START_DATE: start.isoformat(),
+        ATTR_END_DATE: end.isoformat(),
+        "records": records,
+        "next_start": next_start.isoformat() if next_start else None,
+    }
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services every entry of the integration shares."""
+    if hass.services.has_service(DOMAIN, SERVICE_GET_USAGE):
+        return
+
+    async def handle_get_usage(call: ServiceCall) -> ServiceResponse:
+        return await _async_get_usage(hass, call)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_USAGE,
+        handle_get_usage,
+        schema=GET_USAGE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
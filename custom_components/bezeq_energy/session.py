@@ -0,0 +1,175 @@
+"""Session management for the my.bezeq API client."""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import binascii
+import hashlib
+import json
+from typing import TYPE_CHECKING, Any
+
+import homeassistant.util.dt as dt_util
+from homeassistant.helpers.storage import Store
+from my_bezeq import MyBezeqUnauthorizedError
+
+from .const import (
+    DOMAIN,
+    LOGGER,
+    SESSION_STORAGE_VERSION,
+    SESSION_TOKEN_DEFAULT_TTL,
+    SESSION_TOKEN_EXPIRY_MARGIN,
+)
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from homeassistant.core import HomeAssistant
+    from my_bezeq import MyBezeqAPI
+
+    from .throttle import AsyncRateLimiter
+
+
+def get_account_id(username: str) -> str:
+    """Return a stable, non-identifying id for a my.bezeq username."""
+    return hashlib.sha256(username.encode()).hexdigest()[:16]
+
+
+def get_token_expiry(token: str) -> datetime | None:
+    """Read the `exp` claim of a JWT without verifying it."""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+        return dt_util.utc_from_timestamp(float(claims["exp"]))
+    except (IndexError, KeyError, TypeError, ValueError, binascii.Error):
+        return None
+
+
+class BezeqSessionManager:
+    """Keep a my.bezeq session alive across refreshes and restarts."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        client: MyBezeqAPI,
+        limiter: AsyncRateLimiter | None = None,
+    ) -> None:
+        """Initialize."""
+        self._client = client
+        self._limiter = limiter
+        self._store: Store[dict[str, Any]] = Store(
+            hass,
+            SESSION_STORAGE_VERSION,
+            f"{DOMAIN}.session_{get_account_id(client.user_id)}",
+            private=True,
+        )
+        self._token: str | None = None
+        self._expires_at: datetime | None = None
+        self._loaded = False
+        self._dashboard_loaded = False
+        self._lock = asyncio.Lock()
+        self.logins = 0
+        self.logins_avoided = 0
+
+    @property
+    def expires_at(self) -> datetime | None:
+        """Return when the current token expires."""
+        return self._expires_at
+
+    @property
+    def has_valid_token(self) -> bool:
+        """Return True if the current token can still be used."""
+        return (
+            self._token is not None
+            and self._expires_at is not None
+            and dt_util.utcnow() + SESSION_TOKEN_EXPIRY_MARGIN < self._expires_at
+        )
+
+    async def async_ensure_session(self) -> str | None:
+        """Make sure the client holds a usable token, and return that token."""
+        # Refreshes and background jobs share the client, only one may log in
+        async with self._lock:
+            await self._async_ensure_session()
+            return self._token
+
+    async def _async_ensure_session(self) -> None:
+        if not self._loaded:
+            await self._async_load()
+
+        if not self.has_valid_token:
+            await self._async_login()
+            return
+
+        if not self._dashboard_loaded:
+            # A token restored from storage still needs the dashboard call
+            # before the API lets us read any tab
+            self._client.set_jwt(self._token)
+            try:
+                await self._async_throttle()
+                await self._client.dashboard.get_dashboard_tab()
+            except MyBezeqUnauthorizedError:
+                LOGGER.debug("Stored my.bezeq token was rejected, logging in again")
+                await self._async_login()
+                return
+            self._dashboard_loaded = True
+            # Only a stored token saves a login, one in use is simply kept
+            self.logins_avoided += 1
+
+    async def async_invalidate(self, token: str | None = None) -> None:
+        """
+        Drop the current token, forcing a new login on next use.
+
+        Given the `token` a request was rejected with, nothing is dropped if
+        another caller has already replaced it with a new login.
+        """
+        async with self._lock:
+            if token is not None and token != self._token:
+                return
+            self._token = None
+            self._expires_at = None
+            self._dashboard_loaded = False
+            await self._store.async_remove()
+
+    async def _async_login(self) -> None:
+        LOGGER.debug("Logging in to my.bezeq.co.il")
+        self._dashboard_loaded = False
+        await self._async_throttle()
+        token = await self._client.auth.login(
+            self._client.user_id, self._client.password
+        )
+        self.logins += 1
+        self._token = token
+        self._expires_at = (
+            get_token_expiry(token) or dt_util.utcnow() + SESSION_TOKEN_DEFAULT_TTL
+        )
+
+        LOGGER.debug("Successfully logged in to my.bezeq.co.il. Getting dashboard...")
+        await self._async_throttle()
+        await self._client.dashboard.get_dashboard_tab()
+        self._dashboard_loaded = True
+
+        await self._store.async_save(
+            {"token": self._token, "expires_at": self._expires_at.isoformat()}
+        )
+
+    async def _async_throttle(self) -> None:
+        if self._limiter:
+            await self._limiter.acquire()
+
+    async def _async_load(self) -> None:
+        self._loaded = True
+        if not (stored := await self._store.async_load()):
+            return
+
+        self._token = stored.get("token")
+        self._expires_at = dt_util.parse_datetime(stored.get("expires_at") or "")
+
+    def as_diagnostics(self) -> dict[str, Any]:
+        """Return session statistics for diagnostics."""
+        return {
+            "has_valid_token": self.has_valid_token,
+            "expires_at": self._expires_at.isoformat() if self._expires_at else None,
+            "logins": self.logins,
+            "logins_avoided": self.logins_avoided,
+        }
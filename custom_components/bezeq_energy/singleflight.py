@@ -0,0 +1,101 @@
+"""Coalescing of concurrent calls for bezeq_energy."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Hashable
+
+    from homeassistant.core import HomeAssistant
+
+
+class SingleFlight:
+    """
+    Run one call per key at a time, and share its result for a while.
+
+    Callers asking for a key that is already in flight join that call instead
+    of starting their own, and a result younger than `max_age` is returned
+    without calling again. A failed call isn't kept, the next caller retries.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize."""
+        self._hass = hass
+        # Finish time, result and how long the caller meant to keep it
+        self._results: dict[Hashable, tuple[float, Any, float]] = {}
+        self._in_flight: dict[Hashable, asyncio.Task[Any]] = {}
+        self.calls = 0
+        self.shared = 0
+
+    async def async_call(
+        self,
+        key: Hashable,
+        call: Callable[[], Awaitable[Any]],
+        max_age: float = 0,
+    ) -> Any:
+        """Return the result of `call`, shared with every caller of the key."""
+        if (result := self._results.get(key)) and (
+            time.monotonic() - result[0] < max_age
+        ):
+            self.shared += 1
+            return result[1]
+
+        if task := self._in_flight.get(key):
+            self.shared += 1
+        else:
+            # Not started eagerly, the task must be in flight before it finishes
+            task = self._in_flight[key] = self._hass.async_create_task(
+                self._async_run(key, call, max_age),
+                f"{__name__}_{key}",
+                eager_start=False,
+            )
+            task.add_done_callback(_retrieve_exception)
+            self.calls += 1
+        # A caller timing out must not cancel the call for the others
+        return await asyncio.shield(task)
+
+    async def _async_run(
+        self, key: Hashable, call: Callable[[], Awaitable[Any]], max_age: float
+    ) -> Any:
+        try:
+            result = await call()
+        finally:
+            self._in_flight.pop(key, None)
+        now = time.monotonic()
+        # Expired results are dropped as new ones come in, keeping the map small
+        self._results = {
+            cached_key: cached
+            for cached_key, cached in self._results.items()
+            if now - cached[0] < cached[2]
+        }
+        if max_age > 0:
+            self._results[key] = (now, result, max_age)
+        return result
+
+    @callback
+    def async_cancel(self) -> None:
+        """Cancel the calls in flight, e.g. when the entry unloads."""
+        for task in self._in_flight.values():
+            task.cancel()
+        self._in_flight.clear()
+        self._results.clear()
+
+    def as_diagnostics(self) -> dict[str, Any]:
+        """Return call sharing statistics for diagnostics."""
+        return {
+            "calls": self.calls,
+            "shared": self.shared,
+            "in_flight": len(self._in_flight),
+            "cached": len(self._results),
+        }
+
+
+def _retrieve_exception(task: asyncio.Task[Any]) -> None:
+    """Mark a failure as seen, every waiter may have been cancelled."""
+    if not task.cancelled():
+        task.exception()
@@ -0,0 +1,141 @@
+"""Immutable snapshot of the coordinator data."""
+
+from __future__ import annotations
+
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any
+
+from .commons import get_last_invoice, translate_date_period
+from .const import (
+    ANOMALY_KEY,
+    DAILY_USAGE_KEY,
+    ELEC_INVOICE_KEY,
+    FORECAST_KEY,
+    LAST_MONTH_INVOICE_KEY,
+    LAST_MONTH_USAGE_KEY,
+    MONTHLY_USAGE_KEY,
+    MONTHLY_USED_KEY,
+    MY_PACKAGE_KEY,
+    PAYER_DETAILS_KEY,
+    THIS_MONTH_COST_KEY,
+    TIME_OF_USE_KEY,
+    TODAY_COST_KEY,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from my_bezeq import (
+        DailyUsage,
+        ElectricityMonthlyUsedCard,
+        ElectricityMyPackageServiceCard,
+        ElectricityPayerCard,
+        Invoice,
+        InvoicesCard,
+        MonthlyUsage,
+    )
+
+    from .anomaly import AnomalySummary
+    from .forecast import UsageForecast
+    from .ledger import InvoiceLedgerView
+    from .tariff import CostSummary
+    from .tou import TimeOfUseSummary
+
+DATA_KEYS = (
+    DAILY_USAGE_KEY,
+    MONTHLY_USAGE_KEY,
+    LAST_MONTH_USAGE_KEY,
+    PAYER_DETAILS_KEY,
+    MONTHLY_USED_KEY,
+    MY_PACKAGE_KEY,
+    ELEC_INVOICE_KEY,
+    LAST_MONTH_INVOICE_KEY,
+    TODAY_COST_KEY,
+    THIS_MONTH_COST_KEY,
+    TIME_OF_USE_KEY,
+    FORECAST_KEY,
+    ANOMALY_KEY,
+)
+
+
+class BezeqEnergySnapshot:
+    """
+    The data of one refresh, with everything the entities derive from it.
+
+    Built once per refresh, so entities only read attributes: the last invoice
+    is picked and the invoice period is translated here, not on every state
+    write. Older invoices are looked up by month in the invoice ledger view.
+    Other subscribers of the account hang off `subscribers`, each with a
+    snapshot of its own.
+    """
+
+    __slots__ = (
+        *DATA_KEYS,
+        "last_invoice",
+        "last_month_invoice_period",
+        "invoices",
+        "subscribers",
+    )
+
+    daily_usage: DailyUsage | None
+    monthly_usage: MonthlyUsage | None
+    last_month_usage: MonthlyUsage | None
+    payer_details: ElectricityPayerCard | None
+    monthly_used: ElectricityMonthlyUsedCard | None
+    my_package: ElectricityMyPackageServiceCard | None
+    elec_invoice: InvoicesCard | None
+    last_month_invoice: Invoice | None
+    today_cost: CostSummary | None
+    this_month_cost: CostSummary | None
+    time_of_use: TimeOfUseSummary | None
+    forecast: UsageForecast | None
+    consumption_anomaly: AnomalySummary | None
+    last_invoice: Invoice | None
+    last_month_invoice_period: str | None
+    invoices: InvoiceLedgerView | None
+    subscribers: Mapping[str, BezeqEnergySnapshot]
+
+    def __init__(
+        self,
+        values: Mapping[str, Any],
+        subscribers: Mapping[str, BezeqEnergySnapshot] | None = None,
+        invoices: InvoiceLedgerView | None = None,
+    ) -> None:
+        """Initialize from the values of the data keys, computing the rest."""
+        for key in DATA_KEYS:
+            object.__setattr__(self, key, values.get(key))
+
+        object.__setattr__(
+            self,
+            "last_invoice",
+            get_last_invoice(self.elec_invoice.invoices) if self.elec_invoice else None,
+        )
+        object.__setattr__(
+            self,
+            "last_month_invoice_period",
+            translate_date_period(self.last_month_invoice.date_period)
+            if self.last_month_invoice
+            else None,
+        )
+        object.__setattr__(self, "invoices", invoices)
+        object.__setattr__(
+            self, "subscribers", MappingProxyType(dict(subscribers or {}))
+        )
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Refuse changes, a snapshot is shared by every entity."""
+        msg = f"{type(self).__name__} is immutable"
+        raise AttributeError(msg)
+
+    def __delattr__(self, name: str) -> None:
+        """Refuse changes, a snapshot is shared by every entity."""
+        msg = f"{type(self).__name__} is immutable"
+        raise AttributeError(msg)
+
+    def __repr__(self) -> str:
+        """Return the data keys and subscribers of the snapshot."""
+        return f"{type(self).__name__}({self.as_dict()!r}, {dict(self.subscribers)!r})"
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the values of the data keys."""
+        return {key: getattr(self, key) for key in DATA_KEYS}
@@ -0,0 +1,157 @@
+"""Persist the last good coordinator data across restarts."""
+
+from __future__ import annotations
+
+import dataclasses
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, get_args, get_origin
+
+import homeassistant.util.dt as dt_util
+from homeassistant.helpers.storage import Store
+from my_bezeq import (
+    DailyUsage,
+    ElectricityMonthlyUsedCard,
+    ElectricityMyPackageServiceCard,
+    ElectricityPayerCard,
+    Invoice,
+    InvoicesCard,
+    MonthlyUsage,
+)
+
+from .anomaly import AnomalySummary
+from .const import (
+    ANOMALY_KEY,
+    DAILY_USAGE_KEY,
+    DOMAIN,
+    ELEC_INVOICE_KEY,
+    FORECAST_KEY,
+    LAST_MONTH_INVOICE_KEY,
+    LAST_MONTH_USAGE_KEY,
+    LOGGER,
+    MONTHLY_USAGE_KEY,
+    MONTHLY_USED_KEY,
+    MY_PACKAGE_KEY,
+    PAYER_DETAILS_KEY,
+    SNAPSHOT_SAVE_DELAY,
+    SNAPSHOT_STORAGE_VERSION,
+    SUBSCRIBERS_KEY,
+    THIS_MONTH_COST_KEY,
+    TIME_OF_USE_KEY,
+    TODAY_COST_KEY,
+)
+from .forecast import UsageForecast
+from .snapshot import BezeqEnergySnapshot
+from .tariff import CostSummary
+from .tou import TimeOfUseSummary
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+# The my_bezeq models don't round-trip through their own (aliased) dicts, so
+# every persisted key is encoded field by field against its known type
+SNAPSHOT_TYPES: dict[str, type] = {
+    DAILY_USAGE_KEY: DailyUsage,
+    MONTHLY_USAGE_KEY: MonthlyUsage,
+    LAST_MONTH_USAGE_KEY: MonthlyUsage,
+    PAYER_DETAILS_KEY: ElectricityPayerCard,
+    MY_PACKAGE_KEY: ElectricityMyPackageServiceCard,
+    MONTHLY_USED_KEY: ElectricityMonthlyUsedCard,
+    ELEC_INVOICE_KEY: InvoicesCard,
+    LAST_MONTH_INVOICE_KEY: Invoice,
+    TODAY_COST_KEY: CostSummary,
+    THIS_MONTH_COST_KEY: CostSummary,
+    TIME_OF_USE_KEY: TimeOfUseSummary,
+    FORECAST_KEY: UsageForecast,
+    ANOMALY_KEY: AnomalySummary,
+}
+
+
+def _encode(value: Any) -> Any:
+    if dataclasses.is_dataclass(value):
+        return {
+            field.name: _encode(getattr(value, field.name))
+            for field in dataclasses.fields(value)
+        }
+    if isinstance(value, list):
+        return [_encode(item) for item in value]
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _decode(value_type: Any, value: Any) -> Any:
+    if value is None:
+        return None
+    if dataclasses.is_dataclass(value_type):
+        return value_type(
+            **{
+                field.name: _decode(field.type, value.get(field.name))
+                for field in dataclasses.fields(value_type)
+            }
+        )
+    if get_origin(value_type) is list:
+        (item_type,) = get_args(value_type)
+        return [_decode(item_type, item) for item in value]
+    if value_type is datetime:
+        return datetime.fromisoformat(value)
+    return value
+
+
+def _encode_snapshot(snapshot: BezeqEnergySnapshot) -> dict[str, Any]:
+    encoded = {key: _encode(value) for key, value in snapshot.as_dict().items()}
+    if snapshot.subscribers:
+        encoded[SUBSCRIBERS_KEY] = {
+            subscriber: _encode_snapshot(subscriber_snapshot)
+            for subscriber, subscriber_snapshot in snapshot.subscribers.items()
+        }
+    return encoded
+
+
+def _decode_snapshot(stored: dict[str, Any]) -> BezeqEnergySnapshot:
+    # Derived values aren't stored, the snapshot computes them again
+    return BezeqEnergySnapshot(
+        {
+            key: _decode(SNAPSHOT_TYPES[key], value)
+            for key, value in stored.items()
+            if key != SUBSCRIBERS_KEY
+        },
+        subscribers={
+            subscriber: _decode_snapshot(values)
+            for subscriber, values in stored.get(SUBSCRIBERS_KEY, {}).items()
+        },
+    )
+
+
+class SnapshotStore:
+    """Save coordinator data after each refresh and restore it on startup."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, SNAPSHOT_STORAGE_VERSION, f"{DOMAIN}.snapshot_{entry_id}"
+        )
+        self._data: BezeqEnergySnapshot | None = None
+        self._updated_at: datetime | None = None
+
+    async def async_load(self) -> tuple[BezeqEnergySnapshot, datetime] | None:
+        """Return the persisted data and when it was fetched, if any."""
+        if not (stored := await self._store.async_load()):
+            return None
+        try:
+            data = _decode_snapshot(stored["data"])
+        except (AttributeError, KeyError, TypeError, ValueError) as exception:
+            LOGGER.warning("Ignoring unreadable coordinator snapshot: %s", exception)
+            return None
+        return data, dt_util.parse_datetime(stored["updated_at"])
+
+    def async_save(self, data: BezeqEnergySnapshot, updated_at: datetime) -> None:
+        """Schedule a save of the latest coordinator data."""
+        self._data = data
+        self._updated_at = updated_at
+        self._store.async_delay_save(self._data_to_save, SNAPSHOT_SAVE_DELAY)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return {
+            "updated_at": self._updated_at.isoformat(),
+            "data": _encode_snapshot(self._data),
+        }
@@ -0,0 +1,432 @@
+"""Import smart meter usage into Home Assistant long-term statistics."""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from datetime import UTC, date, datetime, time, timedelta
+from itertools import groupby, islice
+from typing import TYPE_CHECKING, Any
+
+import homeassistant.util.dt as dt_util
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    statistics_during_period,
+)
+from homeassistant.const import UnitOfEnergy
+from homeassistant.helpers.storage import Store
+from homeassistant.util import slugify
+from my_bezeq import ElectricReportLevel
+
+from .commons import timezone
+from .const import (
+    DOMAIN,
+    LOGGER,
+    STATISTICS_INITIAL_LOOKBACK,
+    STATISTICS_MAX_DAYS_PER_CYCLE,
+    STATISTICS_REPAIR_MAX_DAYS_PER_CYCLE,
+    STATISTICS_STORAGE_VERSION,
+    UNIT_ILS,
+)
+from .gaps import PeriodBitmap
+from .usage_cache import is_closed_period
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from homeassistant.core import HomeAssistant
+    from my_bezeq import MyBezeqAPI
+
+    from .tariff import Tariff
+    from .usage_cache import UsageCache, UsageRecord
+
+
+def get_record_start(
+    level: ElectricReportLevel, period: date, record: UsageRecord
+) -> datetime:
+    """Return the (aware) start time of an hourly or daily usage record."""
+    if level == ElectricReportLevel.HOURLY:
+        return datetime.combine(period, time(hour=record.usag_hour), tzinfo=timezone)
+    return datetime.combine(record.usage_day.date(), time(), tzinfo=timezone)
+
+
+def get_record_value(level: ElectricReportLevel, record: UsageRecord) -> float | None:
+    """Return the kWh of an hourly or daily usage record."""
+    if level == ElectricReportLevel.HOURLY:
+        return record.sum_all_hour
+    return record.sum_all_day
+
+
+def get_period_index(level: ElectricReportLevel, start: datetime) -> int:
+    """Return the absolute index of the hour (or day) a point starts at."""
+    if level == ElectricReportLevel.HOURLY:
+        return int(start.timestamp()) // 3600
+    return start.astimezone(timezone).date().toordinal()
+
+
+def get_period_start(level: ElectricReportLevel, index: int) -> datetime:
+    """Return the (aware) start time of an absolute hour (or day) index."""
+    if level == ElectricReportLevel.HOURLY:
+        return datetime.fromtimestamp(index * 3600, UTC)
+    return datetime.combine(date.fromordinal(index), time(), tzinfo=timezone)
+
+
+def get_day_indexes(level: ElectricReportLevel, day: date) -> range:
+    """Return the hour (or day) indexes of a local day."""
+    first = datetime.combine(day, time(), tzinfo=timezone)
+    return range(
+        get_period_index(level, first),
+        get_period_index(level, first + timedelta(days=1)),
+    )
+
+
+class BezeqStatisticsImporter:
+    """
+    Write usage as external statistics, one point per hour (or day).
+
+    A persisted watermark holds the start of the last imported point and the
+    running sums, so each cycle only imports new points and never has to read
+    the statistics table back. The cost of each point is written alongside, at
+    the tariff in effect when it is imported. A bitmap of the imported periods
+    finds the holes an outage leaves behind the watermark, so they can be
+    repaired without a full re-import.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        contract_number: str,
+        usage_cache: UsageCache,
+        level: ElectricReportLevel = ElectricReportLevel.HOURLY,
+    ) -> None:
+        """Initialize."""
+        self._hass = hass
+        self._usage_cache = usage_cache
+        self._level = level
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STATISTICS_STORAGE_VERSION, f"{DOMAIN}.statistics_{entry_id}"
+        )
+        self.statistic_id = f"{DOMAIN}:{slugify(contract_number)}_energy_consumption"
+        self._metadata = StatisticMetaData(
+            has_mean=False,
+            has_sum=True,
+            name=f"Bezeq Energy {contract_number} Consumption",
+            source=DOMAIN,
+            statistic_id=self.statistic_id,
+            unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        )
+        self.cost_statistic_id = f"{DOMAIN}:{slugify(contract_number)}_energy_cost"
+        self._cost_metadata = StatisticMetaData(
+            has_mean=False,
+            has_sum=True,
+            name=f"Bezeq Energy {contract_number} Cost",
+            source=DOMAIN,
+            statistic_id=self.cost_statistic_id,
+            unit_of_measurement=UNIT_ILS,
+        )
+        self.last_imported: datetime | None = None
+        self._sum = 0.0
+        self._cost_sum = 0.0
+        self._imported = PeriodBitmap()
+        # Settled periods Bezeq has no reading of, given up on by the repair
+        self.unrecoverable = 0
+
+    @property
+    def level(self) -> ElectricReportLevel:
+        """Return the report level points are imported at."""
+        return self._level
+
+    async def async_load(self) -> None:
+        """Load the watermark from storage."""
+        if not (stored := await self._store.async_load()):
+            return
+        self.last_imported = dt_util.parse_datetime(stored["last_imported"])
+        self._sum = stored["sum"]
+        self._cost_sum = stored.get("cost_sum", 0.0)
+        if imported := stored.get("imported"):
+            # Without one, the index starts at the next import
+            self._imported = PeriodBitmap.from_dict(imported)
+        self.unrecoverable = stored.get("unrecoverable", 0)
+
+    @property
+    def missing(self) -> int:
+        """Return how many periods are missing below the watermark."""
+        return self._imported.missing
+
+    async def async_import(self, api: MyBezeqAPI, today: date, tariff: Tariff) -> int:
+        """Import the points that appeared since the watermark."""
+        if self.last_imported:
+            start = self.last_imported.astimezone(timezone).date()
+        else:
+            start = today - STATISTICS_INITIAL_LOOKBACK
+        # Catch up a few days per cycle rather than stalling the refresh
+        end = min(today, start + timedelta(days=STATISTICS_MAX_DAYS_PER_CYCLE - 1))
+
+        usage = await self._usage_cache.async_get_usage_by_period(
+            api, self._level, start, end
+        )
+        return await self.async_add_usage(usage, tariff, today)
+
+    async def async_add_usage(
+        self, usage: dict[date, list[UsageRecord]], tariff: Tariff, today: date
+    ) -> int:
+        """
+        Add the settled records newer than the watermark and advance it.
+
+        Points can't be corrected once imported, so days still filling in are
+        left out and the watermark stays behind them until they settle.
+        """
+        points = sorted(
+            (get_record_start(self._level, period, record), value)
+            for period, records in usage.items()
+            if is_closed_period(ElectricReportLevel.DAILY, period, today)
+            for record in records
+            if (value := get_record_value(self._level, record)) is not None
+        )
+        if self.last_imported:
+            points = [point for point in points if point[0] > self.last_imported]
+        if not points:
+            await self._async_skip_empty_periods(usage, today)
+            return 0
+
+        self._sum, self._cost_sum = self._add_statistics(
+            points, tariff, self._sum, self._cost_sum
+        )
+        self.last_imported = points[-1][0]
+
+        LOGGER.debug(
+            "Importing %s points into %s, up to %s",
+            len(points),
+            self.statistic_id,
+            self.last_imported,
+        )
+        await self._async_save()
+        return len(points)
+
+    async def _async_skip_empty_periods(
+        self, usage: dict[date, list[UsageRecord]], today: date
+    ) -> None:
+        """
+        Move the watermark past settled days that have no readings at all.
+
+        Otherwise a meter outage as long as the import window keeps every cycle
+        reading the same empty days. Skipped days are gaps the repair retries.
+        """
+        if not (
+            closed := [
+                period
+                for period in usage
+                if is_closed_period(ElectricReportLevel.DAILY, period, today)
+            ]
+        ):
+            return
+        last_start = get_period_start(
+            self._level, get_day_indexes(self._level, max(closed))[-1]
+        )
+        if self.last_imported and last_start <= self.last_imported:
+            return
+        LOGGER.debug(
+            "No usage to import into %s up to %s, skipping ahead",
+            self.statistic_id,
+            last_start,
+        )
+        self.last_imported = last_start
+        await self._async_save()
+
+    async def async_repair(self, api: MyBezeqAPI, today: date, tariff: Tariff) -> int:
+        """
+        Import the settled periods missing below the watermark.
+
+        Missing days are merged into ranges, so each range costs one request per
+        report period (a day of hourly usage, a month of daily usage). Each run
+        of repaired points continues from the sum read back before it, and the
+        sums after it are shifted by what it added. Returns how many periods
+        are still missing.
+        """
+        if not (gaps := list(self._imported.iter_gaps())):
+            return 0
+        days = list(
+            islice(
+                (
+                    day
+                    for day, _ in groupby(
+                        get_period_start(self._level, index).astimezone(timezone).date()
+                        for first, last in gaps
+                        for index in range(first, last + 1)
+                    )
+                    # Recent days may still be filling in, leave them to the import
+                    if is_closed_period(ElectricReportLevel.DAILY, day, today)
+                ),
+                STATISTICS_REPAIR_MAX_DAYS_PER_CYCLE,
+            )
+        )
+        if not days:
+            return self.missing
+
+        usage: dict[date, list[UsageRecord]] = {}
+        for _, group in groupby(
+            enumerate(days), lambda item: item[1].toordinal() - item[0]
+        ):
+            days_in_range = [day for _, day in group]
+            usage |= await self._usage_cache.async_get_usage_by_period(
+                api, self._level, days_in_range[0], days_in_range[-1]
+            )
+
+        points = sorted(
+            (start, value)
+            for period, records in usage.items()
+            for record in records
+            if (value := get_record_value(self._level, record)) is not None
+            and self._in_gap(
+                get_period_index(
+                    self._level,
+                    start := get_record_start(self._level, period, record),
+                )
+            )
+        )
+        # A run is the points repaired in one gap, sums already follow each gap
+        gap_starts = [first for first, _ in gaps]
+        runs = [
+            list(run)
+            for _, run in groupby(
+                points,
+                lambda point: bisect_right(
+                    gap_starts, get_period_index(self._level, point[0])
+                ),
+            )
+        ]
+        bases = [await self._async_get_sums_before(run[0][0]) for run in runs]
+
+        instance = get_instance(self._hass)
+        added = added_cost = 0.0
+        for run, (base_sum, base_cost_sum) in zip(runs, bases, strict=True):
+            # Earlier runs of this repair already shifted the sums before this one
+            run_sum, run_cost_sum = self._add_statistics(
+                run, tariff, base_sum + added, base_cost_sum + added_cost
+            )
+            run_added = run_sum - base_sum - added
+            run_added_cost = run_cost_sum - base_cost_sum - added_cost
+            after = get_period_start(
+                self._level, get_period_index(self._level, run[-1][0]) + 1
+            )
+            instance.async_adjust_statistics(
+                self.statistic_id, after, run_added, UnitOfEnergy.KILO_WATT_HOUR
+            )
+            instance.async_adjust_statistics(
+                self.cost_statistic_id, after, run_added_cost, UNIT_ILS
+            )
+            added += run_added
+            added_cost += run_added_cost
+        self._sum += added
+        self._cost_sum += added_cost
+
+        # Whatever is still missing of a settled day will never show up
+        for day in days:
+            for index in get_day_indexes(self._level, day):
+                if self._in_gap(index):
+                    self._imported.add(index)
+                    self.unrecoverable += 1
+
+        await self._async_save()
+        LOGGER.info(
+            "Repaired %s points of %s over %s days, %s periods still missing",
+            len(points),
+            self.statistic_id,
+            len(days),
+            self.missing,
+        )
+        return self.missing
+
+    def _in_gap(self, index: int) -> bool:
+        """Return True if a period is missing between the first and last import."""
+        return (
+            self._imported.origin is not None
+            and self._imported.origin
+            <= index
+            < self._imported.origin + len(self._imported)
+            and index not in self._imported
+        )
+
+    def _add_statistics(
+        self,
+        points: Iterable[tuple[datetime, float]],
+        tariff: Tariff,
+        total: float,
+        cost_total: float,
+    ) -> tuple[float, float]:
+        """Add points on top of the given sums, return the sums after them."""
+        # A daily point is priced at the mean of its day's hours
+        hours = 1 if self._level == ElectricReportLevel.HOURLY else 24
+        statistics: list[StatisticData] = []
+        cost_statistics: list[StatisticData] = []
+        for start, value in points:
+            cost = value * tariff.price_at(start, hours)
+            total += value
+            cost_total += cost
+            statistics.append(StatisticData(start=start, state=value, sum=total))
+            cost_statistics.append(
+                StatisticData(start=start, state=cost, sum=cost_total)
+            )
+            self._imported.add(get_period_index(self._level, start))
+        async_add_external_statistics(self._hass, self._metadata, statistics)
+        async_add_external_statistics(self._hass, self._cost_metadata, cost_statistics)
+        return total, cost_total
+
+    async def _async_get_sums_before(self, start: datetime) -> tuple[float, float]:
+        """Read back the sums of the last points before `start`."""
+        instance = get_instance(self._hass)
+        # Earlier imports are only queued, let them land first
+        await instance.async_block_till_done()
+        # Reduced per month, a few rows cover the whole index
+        rows = await instance.async_add_executor_job(
+            statistics_during_period,
+            self._hass,
+            get_period_start(self._level, self._imported.origin),
+            start,
+            {self.statistic_id, self.cost_statistic_id},
+            "month",
+            None,
+            {"sum"},
+        )
+        return tuple(
+            next(
+                (
+                    row["sum"]
+                    for row in reversed(rows.get(statistic_id, []))
+                    if row.get("sum") is not None
+                ),
+                0.0,
+            )
+            for statistic_id in (self.statistic_id, self.cost_statistic_id)
+        )
+
+    async def _async_save(self) -> None:
+        await self._store.async_save(
+            {
+                "last_imported": self.last_imported.isoformat()
+                if self.last_imported
+                else None,
+                "sum": self._sum,
+                "cost_sum": self._cost_sum,
+                "imported": self._imported.as_dict(),
+                "unrecoverable": self.unrecoverable,
+            }
+        )
+
+    def as_diagnostics(self) -> dict[str, Any]:
+        """Return the import watermark for diagnostics."""
+        return {
+            "statistic_id": self.statistic_id,
+            "level": self._level.name,
+            "last_imported": self.last_imported.isoformat()
+            if self.last_imported
+            else None,
+            "sum": self._sum,
+            "cost_statistic_id": self.cost_statistic_id,
+            "cost_sum": self._cost_sum,
+            "imported": len(self._imported),
+            "missing": self.missing,
+            "unrecoverable": self.unrecoverable,
+        }
@@ -0,0 +1,161 @@
+"""Electricity tariff and cost calculation for bezeq_energy."""
+
+from __future__ import annotations
+
+import math
+import operator
+import re
+from array import array
+from dataclasses import dataclass
+from datetime import UTC, timedelta
+from enum import StrEnum
+from itertools import compress
+from typing import TYPE_CHECKING
+
+from .commons import timezone
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from datetime import datetime
+
+    from my_bezeq import ElectricityMyPackageServiceCard
+
+_DISCOUNT_PATTERN = re.compile(r"(\d+(?:\.\d+)?)\s*%")
+
+WEEK_SLOTS = 7 * 24
+# Python weekdays, Monday is 0. The Israeli work week runs Sunday to Thursday.
+WORK_DAYS = frozenset({6, 0, 1, 2, 3})
+WEEKEND_DAYS = frozenset({4, 5})
+
+
+class PackageWindow(StrEnum):
+    """The hours a package's discount applies to."""
+
+    FLAT = "flat"
+    DAY = "day"  # 07:00-17:00, Sunday to Thursday
+    NIGHT = "night"  # 23:00-07:00, nights starting Sunday to Thursday
+
+
+def get_week_slot(when: datetime) -> int:
+    """Return the hour of the (local) week `when` falls in, Monday 00:00 is 0."""
+    local = when.astimezone(timezone)
+    return local.weekday() * 24 + local.hour
+
+
+def get_week_slots(start: datetime, count: int) -> list[int]:
+    """Return the hour of the (local) week of each of `count` hours from `start`."""
+    # Hours are stepped in UTC and placed one by one, the local week gains or
+    # loses an hour at DST changes
+    start = start.astimezone(UTC)
+    return [get_week_slot(start + timedelta(hours=hour)) for hour in range(count)]
+
+
+def _week_mask(hours_by_day: dict[int, range]) -> bytes:
+    mask = bytearray(WEEK_SLOTS)
+    for day, hours in hours_by_day.items():
+        for hour in hours:
+            mask[day * 24 + hour] = 1
+    return bytes(mask)
+
+
+WINDOW_MASKS: dict[PackageWindow, bytes] = {
+    PackageWindow.FLAT: bytes([1]) * WEEK_SLOTS,
+    PackageWindow.DAY: _week_mask(dict.fromkeys(WORK_DAYS, range(7, 17))),
+    PackageWindow.NIGHT: bytes(
+        a | b
+        for a, b in zip(
+            _week_mask(dict.fromkeys(WORK_DAYS, range(23, 24))),
+            # The mornings after, Monday to Friday
+            _week_mask(dict.fromkeys({0, 1, 2, 3, 4}, range(7))),
+            strict=True,
+        )
+    ),
+}
+WEEKEND_MASK = _week_mask(dict.fromkeys(WEEKEND_DAYS, range(24)))
+
+
+def parse_discount(text: str | None) -> float:
+    """Return the discount of a package card (e.g. "7% הנחה") as a fraction."""
+    if not text or not (match := _DISCOUNT_PATTERN.search(text)):
+        return 0.0
+    return min(float(match.group(1)), 100.0) / 100
+
+
+def parse_window(package: ElectricityMyPackageServiceCard | None) -> PackageWindow:
+    """Return the discount hours of a package, from its name and description."""
+    if package is None:
+        return PackageWindow.FLAT
+    text = f"{package.package_name} {package.description}"
+    if "לילה" in text:
+        return PackageWindow.NIGHT
+    if "יום" in text:
+        return PackageWindow.DAY
+    return PackageWindow.FLAT
+
+
+@dataclass(frozen=True, slots=True)
+class Tariff:
+    """Price per kWh, with the package discount applying to its window."""
+
+    price: float
+    discount: float = 0.0
+    window: PackageWindow = PackageWindow.FLAT
+
+    @property
+    def effective_price(self) -> float:
+        """Return the price per kWh inside the discount window."""
+        return self.price * (1 - self.discount)
+
+    @property
+    def week_prices(self) -> array[float]:
+        """Return the price of each hour of the week."""
+        prices = (self.price, self.effective_price)
+        return array("d", map(prices.__getitem__, WINDOW_MASKS[self.window]))
+
+    @property
+    def mean_price(self) -> float:
+        """Return the mean price per kWh over the hours of a week."""
+        return math.fsum(self.week_prices) / WEEK_SLOTS
+
+    def prices(self, start: datetime, count: int) -> array[float]:
+        """Return the price of each of `count` consecutive hours from `start`."""
+        week_prices = self.week_prices
+        return array("d", map(week_prices.__getitem__, get_week_slots(start, count)))
+
+    def price_at(self, start: datetime, hours: int = 1) -> float:
+        """Return the mean price over `hours` hours from `start`."""
+        return math.fsum(self.prices(start, hours)) / hours
+
+
+@dataclass(frozen=True, slots=True)
+class CostSummary:
+    """Usage and cost over a period."""
+
+    kwh: float
+    cost: float
+    hours: int
+    price: float
+    discount: float
+
+
+def compute_cost(
+    tariff: Tariff, usage: Sequence[float], start: datetime
+) -> CostSummary:
+    """
+    Return the cost of an hourly usage series, skipping unknown (NaN) hours.
+
+    The series is handled as a whole by C-level iterators: a mask of the known
+    hours is built once, then compressed usage and prices are multiplied and
+    summed without a Python-level loop over the points.
+    """
+    known = bytes(map(operator.not_, map(math.isnan, usage)))
+    prices = tariff.prices(start, len(usage))
+    return CostSummary(
+        kwh=math.fsum(compress(usage, known)),
+        cost=math.fsum(
+            map(operator.mul, compress(usage, known), compress(prices, known))
+        ),
+        hours=sum(known),
+        price=tariff.effective_price,
+        discount=tariff.discount,
+    )
@@ -0,0 +1,32 @@
+"""Request throttling helpers for bezeq_energy."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+
+class AsyncRateLimiter:
+    """Space out requests so no more than `rate` start per `period` seconds."""
+
+    def __init__(self, rate: float, period: float = 60) -> None:
+        """Initialize."""
+        self._interval = period / rate
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until the next request is allowed to start."""
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self._interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    async def __aenter__(self) -> None:
+        """Acquire a slot."""
+        await self.acquire()
+
+    async def __aexit__(self, *args: object) -> None:
+        """Nothing to release, slots expire with time."""
@@ -0,0 +1,154 @@
+"""Time-of-use bucketing of hourly usage for bezeq_energy."""
+
+from __future__ import annotations
+
+import math
+import operator
+from dataclasses import dataclass
+from enum import IntEnum
+from itertools import compress, repeat
+from typing import TYPE_CHECKING, Any
+
+from .commons import timezone
+from .interval import get_slot, get_slot_start
+from .tariff import WEEKEND_MASK, WINDOW_MASKS, get_week_slot, get_week_slots
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from datetime import date, datetime
+
+    from .interval import IntervalStore
+    from .tariff import PackageWindow, Tariff
+
+
+class Bucket(IntEnum):
+    """Time-of-use buckets, the package's discount hours first."""
+
+    DISCOUNTED = 0
+    REGULAR = 1
+    WEEKEND = 2
+
+
+def get_bucket_map(window: PackageWindow) -> bytes:
+    """Return the bucket of every hour of the week under a package window."""
+    return bytes(
+        Bucket.DISCOUNTED
+        if discounted
+        else Bucket.WEEKEND
+        if weekend
+        else Bucket.REGULAR
+        for discounted, weekend in zip(WINDOW_MASKS[window], WEEKEND_MASK, strict=True)
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class TimeOfUseSummary:
+    """Usage of the month per bucket, and what the discount saved."""
+
+    window: str
+    discounted: float
+    regular: float
+    weekend: float
+    savings: float
+
+
+class TimeOfUseBuckets:
+    """
+    The kWh of the current month per bucket, for one subscriber.
+
+    Every hour of the week is mapped to its bucket once, when the package
+    window is known. A new or corrected reading then only moves the difference
+    into its bucket, and the month is summed in full only on a reset.
+    """
+
+    __slots__ = ("_bucket_map", "kwh", "month", "window")
+
+    def __init__(self, window: PackageWindow) -> None:
+        """Initialize."""
+        self.window = window
+        self._bucket_map = get_bucket_map(window)
+        self.month: date | None = None
+        self.kwh = [0.0] * len(Bucket)
+
+    def reset(self, month: date, series: Sequence[float], start: datetime) -> None:
+        """Sum a month-to-date hourly series starting at `start` into buckets."""
+        self.month = month
+        # Placed like `add` does, so both agree on an hour across DST changes
+        buckets = bytes(
+            map(self._bucket_map.__getitem__, get_week_slots(start, len(series)))
+        )
+        known = bytes(map(operator.not_, map(math.isnan, series)))
+        for bucket in Bucket:
+            mask = bytes(
+                map(
+                    operator.and_,
+                    known,
+                    map(operator.eq, buckets, repeat(bucket)),
+                )
+            )
+            self.kwh[bucket] = math.fsum(compress(series, mask))
+
+    def add(self, start: datetime, old: float, new: float) -> None:
+        """Move the change of one hourly reading into its bucket."""
+        local = start.astimezone(timezone)
+        if self.month is None or local.date().replace(day=1) != self.month:
+            # Older months are done with, a new month starts with the next reset
+            return
+        delta = (0.0 if math.isnan(new) else new) - (0.0 if math.isnan(old) else old)
+        self.kwh[self._bucket_map[get_week_slot(local)]] += delta
+
+
+class TimeOfUseTracker:
+    """Keep the time-of-use buckets of every subscriber in step with the intervals."""
+
+    def __init__(self, intervals: IntervalStore) -> None:
+        """Initialize."""
+        self._intervals = intervals
+        self._buckets: dict[str, TimeOfUseBuckets] = {}
+        self.resets = 0
+        intervals.add_listener(self._on_interval)
+
+    def _on_interval(self, subscriber: str, slot: int, old: float, new: float) -> None:
+        if buckets := self._buckets.get(subscriber):
+            buckets.add(get_slot_start(slot), old, new)
+
+    def get_summary(
+        self, subscriber: str, tariff: Tariff, now: datetime
+    ) -> TimeOfUseSummary:
+        """Return this month's buckets of a subscriber under the tariff's window."""
+        month_start = now.astimezone(timezone).replace(
+            day=1, hour=0, minute=0, second=0, microsecond=0
+        )
+        buckets = self._buckets.get(subscriber)
+        if (
+            buckets is None
+            or buckets.window != tariff.window
+            or buckets.month != month_start.date()
+        ):
+            # A new subscriber, package or month, sum the month up once
+            buckets = self._buckets[subscriber] = TimeOfUseBuckets(tariff.window)
+            end = get_slot_start(get_slot(now) + 1)
+            buckets.reset(
+                month_start.date(),
+                self._intervals.series(
+                    lambda candidate: candidate == subscriber, month_start, end
+                ),
+                month_start,
+            )
+            self.resets += 1
+
+        discounted = buckets.kwh[Bucket.DISCOUNTED]
+        return TimeOfUseSummary(
+            window=tariff.window,
+            discounted=discounted,
+            regular=buckets.kwh[Bucket.REGULAR],
+            weekend=buckets.kwh[Bucket.WEEKEND],
+            savings=discounted * (tariff.price - tariff.effective_price),
+        )
+
+    def as_diagnostics(self) -> dict[str, Any]:
+        """Return the bucket state for diagnostics."""
+        return {
+            "subscribers": len(self._buckets),
+            "resets": self.resets,
+        }
@@ -0,0 +1,364 @@
+"""Persistent cache of my.bezeq usage reports for closed periods."""
+
+from __future__ import annotations
+
+import itertools
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+import homeassistant.util.dt as dt_util
+from dateutil.relativedelta import relativedelta
+from homeassistant.helpers.storage import Store
+from my_bezeq import DailyUsage, ElectricReportLevel, HourlyUsage, MonthlyUsage
+
+from .commons import timezone
+from .const import (
+    DOMAIN,
+    LOGGER,
+    USAGE_CACHE_MAX_ENTRIES,
+    USAGE_CACHE_SAVE_DELAY,
+    USAGE_CACHE_SETTLE_TIME,
+    USAGE_CACHE_STORAGE_VERSION,
+    USAGE_REPORT_TTL,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+    from homeassistant.core import HomeAssistant
+    from my_bezeq import (
+        GetDailyElectricReportResponse,
+        GetMonthlyElectricReportResponse,
+        GetYearlyElectricReportResponse,
+        MyBezeqAPI,
+    )
+
+    from .singleflight import SingleFlight
+    from .throttle import AsyncRateLimiter
+
+type UsageRecord = MonthlyUsage | DailyUsage | HourlyUsage
+
+
+def get_period(level: ElectricReportLevel, record: UsageRecord) -> date:
+    """Return the period a daily or monthly usage record belongs to."""
+    if level == ElectricReportLevel.MONTHLY:
+        return record.usage_month.date().replace(day=1)
+    return record.usage_day.date()
+
+
+def iter_periods(level: ElectricReportLevel, start: date, end: date) -> list[date]:
+    """Return every period between `start` and `end`, inclusive."""
+    step = (
+        relativedelta(months=1)
+        if level == ElectricReportLevel.MONTHLY
+        else relativedelta(days=1)
+    )
+    period = start.replace(day=1) if level == ElectricReportLevel.MONTHLY else start
+    periods = []
+    while period <= end:
+        periods.append(period)
+        period += step
+    return periods
+
+
+def get_period_end(level: ElectricReportLevel, period: date) -> date:
+    """Return the first day after `period`."""
+    if level == ElectricReportLevel.MONTHLY:
+        return period + relativedelta(months=1)
+    return period + timedelta(days=1)
+
+
+def get_page_end(level: ElectricReportLevel, period: date) -> date:
+    """Return the last day a single report request from `period` covers."""
+    match level:
+        case ElectricReportLevel.HOURLY:
+            return period
+        case ElectricReportLevel.DAILY:
+            return period + relativedelta(day=31)
+    return period.replace(month=12, day=31)
+
+
+def is_closed_period(level: ElectricReportLevel, period: date, today: date) -> bool:
+    """Return True if usage of `period` can no longer change."""
+    # Smart meter readings trickle in late, give them time to settle
+    return get_period_end(level, period) + USAGE_CACHE_SETTLE_TIME <= today
+
+
+def _encode(record: UsageRecord) -> dict[str, Any]:
+    encoded = {"subscriber": record.subscriber, "mone": record.mone}
+    match record:
+        case MonthlyUsage():
+            encoded["usage_month"] = record.usage_month.isoformat()
+            encoded["value"] = record.sum_all_month
+        case DailyUsage():
+            encoded["usage_day"] = record.usage_day.isoformat()
+            encoded["value"] = record.sum_all_day
+        case HourlyUsage():
+            encoded["usag_hour"] = record.usag_hour
+            encoded["value"] = record.sum_all_hour
+    return encoded
+
+
+def _decode(level: ElectricReportLevel, encoded: dict[str, Any]) -> UsageRecord:
+    match level:
+        case ElectricReportLevel.MONTHLY:
+            return MonthlyUsage(
+                subscriber=encoded["subscriber"],
+                mone=encoded["mone"],
+                usage_month=datetime.fromisoformat(encoded["usage_month"]),
+                sum_all_month=encoded["value"],
+            )
+        case ElectricReportLevel.DAILY:
+            return DailyUsage(
+                subscriber=encoded["subscriber"],
+                mone=encoded["mone"],
+                usage_day=datetime.fromisoformat(encoded["usage_day"]),
+                sum_all_day=encoded["value"],
+            )
+        case ElectricReportLevel.HOURLY:
+            return HourlyUsage(
+                subscriber=encoded["subscriber"],
+                mone=encoded["mone"],
+                usag_hour=encoded["usag_hour"],
+                sum_all_hour=encoded["value"],
+            )
+
+
+class UsageCache:
+    """
+    Cache of usage records keyed by (report level, period).
+
+    Only closed periods are cached, and those are never fetched again. The open
+    period (today, the current month) always goes to the API, through the
+    account's `flights` if given, so overlapping refreshes, backfill and service
+    calls share one request for the same report.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        max_entries: dict[str, int] | None = None,
+        flights: SingleFlight | None = None,
+    ) -> None:
+        """Initialize."""
+        self._flights = flights
+        self._store: Store[dict[str, Any]] = Store(
+            hass, USAGE_CACHE_STORAGE_VERSION, f"{DOMAIN}.usage_cache_{entry_id}"
+        )
+        # Per report level, so hours don't evict the much longer daily history
+        self._max_entries = max_entries or USAGE_CACHE_MAX_ENTRIES
+        # Least recently used first
+        self._entries: OrderedDict[str, list[dict[str, Any]]] = OrderedDict()
+        self._counts: dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def async_load(self) -> None:
+        """Load the cache from storage."""
+        if stored := await self._store.async_load():
+            self._entries = OrderedDict(stored["entries"])
+            for key in self._entries:
+                level_name = key.partition(":")[0]
+                self._counts[level_name] = self._counts.get(level_name, 0) + 1
+
+    def get(self, level: ElectricReportLevel, period: date) -> list[UsageRecord] | None:
+        """Return the cached records of a closed period, if any."""
+        key = f"{level.name}:{period.isoformat()}"
+        if (entry := self._entries.get(key)) is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return [_decode(level, encoded) for encoded in entry]
+
+    def put(
+        self,
+        level: ElectricReportLevel,
+        period: date,
+        records: list[UsageRecord],
+        today: date,
+    ) -> None:
+        """
+        Cache the records of `period` if the period is closed.
+
+        A closed period without records is cached too, e.g. days before the
+        meter was installed, so it isn't asked for again on every call.
+        """
+        if not is_closed_period(level, period, today):
+            return
+
+        key = f"{level.name}:{period.isoformat()}"
+        if key not in self._entries:
+            self._counts[level.name] = self._counts.get(level.name, 0) + 1
+        self._entries[key] = [_encode(record) for record in records]
+        self._entries.move_to_end(key)
+        while self._counts[level.name] > self._max_entries.get(level.name, 0):
+            # The least recently used entry of the same level
+            del self._entries[
+                next(
+                    cached_key
+                    for cached_key in self._entries
+                    if cached_key.startswith(f"{level.name}:")
+                )
+            ]
+            self._counts[level.name] -= 1
+
+        self._store.async_delay_save(self._data_to_save, USAGE_CACHE_SAVE_DELAY)
+
+    async def async_get_usage(
+        self,
+        api: MyBezeqAPI,
+        level: ElectricReportLevel,
+        start: date,
+        end: date,
+    ) -> list[UsageRecord]:
+        """Return the usage records of every period between `start` and `end`."""
+        usage = await self.async_get_usage_by_period(api, level, start, end)
+        return [record for records in usage.values() for record in records]
+
+    async def async_iter_usage(
+        self,
+        api: MyBezeqAPI,
+        level: ElectricReportLevel,
+        start: date,
+        end: date,
+        limiter: AsyncRateLimiter | None = None,
+    ) -> AsyncIterator[tuple[date, list[UsageRecord]]]:
+        """
+        Yield the usage records between `start` and `end` by period, a page at a time.
+
+        A page is what one report request covers (a day of hourly usage, a month
+        of daily usage, a year of monthly usage), so however long the range only
+        one page of records is held, and nothing is fetched past where the caller
+        stops. Pages that aren't fully cached wait for the `limiter` first.
+        """
+        page_start = start
+        while page_start <= end:
+            page_end = min(get_page_end(level, page_start), end)
+            if limiter and not all(
+                self._is_cached(level, period)
+                for period in iter_periods(level, page_start, page_end)
+            ):
+                await limiter.acquire()
+            usage = await self.async_get_usage_by_period(
+                api, level, page_start, page_end
+            )
+            for period, records in usage.items():
+                yield period, records
+            page_start = page_end + timedelta(days=1)
+
+    def _is_cached(self, level: ElectricReportLevel, period: date) -> bool:
+        return f"{level.name}:{period.isoformat()}" in self._entries
+
+    async def async_get_usage_by_period(
+        self,
+        api: MyBezeqAPI,
+        level: ElectricReportLevel,
+        start: date,
+        end: date,
+        *,
+        cache: bool = True,
+    ) -> dict[date, list[UsageRecord]]:
+        """
+        Return the usage records between `start` and `end`, grouped by period.
+
+        Closed periods come from the cache. Missing ones are fetched with as few
+        requests as possible and, unless `cache` is False, cached if closed.
+        """
+        periods = iter_periods(level, start, end)
+        records_by_period: dict[date, list[UsageRecord]] = {}
+        missing: list[date] = []
+        for period in periods:
+            if (cached := self.get(level, period)) is not None:
+                records_by_period[period] = cached
+            else:
+                missing.append(period)
+
+        if missing:
+            today = dt_util.now(timezone).date()
+            fetched = await self._async_fetch(api, level, missing)
+            for period in missing:
+                records = fetched.get(period, [])
+                records_by_period[period] = records
+                if cache:
+                    self.put(level, period, records, today)
+
+        return {period: records_by_period[period] for period in periods}
+
+    async def _async_fetch(
+        self,
+        api: MyBezeqAPI,
+        level: ElectricReportLevel,
+        periods: list[date],
+    ) -> dict[date, list[UsageRecord]]:
+        fetched: dict[date, list[UsageRecord]] = {}
+        if level == ElectricReportLevel.HOURLY:
+            # Hourly records only carry the hour, so every day is its own request
+            for period in periods:
+                LOGGER.debug("Fetching hourly usage of %s", period)
+                # Both ends are inclusive, the next day would be a second one
+                response = await self._async_get_report(api, level, period, period)
+                fetched[period] = list(response.usage_data or [])
+            return fetched
+
+        # The daily report covers one month per request
+        groups = (
+            itertools.groupby(periods, key=lambda period: period.replace(day=1))
+            if level == ElectricReportLevel.DAILY
+            else [(None, iter(periods))]
+        )
+        for _, group in groups:
+            group_periods = list(group)
+            LOGGER.debug(
+                "Fetching %s usage of %s - %s",
+                level.name,
+                group_periods[0],
+                group_periods[-1],
+            )
+            # Report ranges are inclusive, a daily one ends on the last day asked for
+            to_date = group_periods[-1]
+            if level == ElectricReportLevel.MONTHLY:
+                to_date = get_period_end(level, to_date) - timedelta(days=1)
+            response = await self._async_get_report(
+                api, level, group_periods[0], to_date
+            )
+            # Records of another group's periods would be stored twice
+            requested = set(group_periods)
+            for record in response.usage_data or []:
+                if (period := get_period(level, record)) in requested:
+                    fetched.setdefault(period, []).append(record)
+        return fetched
+
+    async def _async_get_report(
+        self,
+        api: MyBezeqAPI,
+        level: ElectricReportLevel,
+        from_date: date,
+        to_date: date,
+    ) -> (
+        GetDailyElectricReportResponse
+        | GetMonthlyElectricReportResponse
+        | GetYearlyElectricReportResponse
+    ):
+        fetch = partial(api.electric.get_elec_usage_report, level, from_date, to_date)
+        if self._flights is None:
+            return await fetch()
+        return await self._flights.async_call(
+            ("usage_report", level.name, from_date, to_date), fetch, USAGE_REPORT_TTL
+        )
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return {"entries": self._entries}
+
+    def as_diagnostics(self) -> dict[str, Any]:
+        """Return cache statistics for diagnostics."""
+        return {
+            "entries": dict(self._counts),
+            "max_entries": self._max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+        }